@@ -0,0 +1,37 @@
+from collections import namedtuple
+import pygame
+
+AtlasEntry = namedtuple("AtlasEntry", ["frames", "flipped"])
+
+
+class SpriteAtlas:
+    """Process-wide store of procedurally drawn animation frames.
+
+    Each key is drawn once by its builder, converted to the display format
+    when a display exists, and paired with horizontally flipped copies.
+    Every sprite of that kind then shares the same surfaces, so they must be
+    treated as read-only.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, builder):
+        entry = self.entries.get(key)
+        if entry is None:
+            frames = builder()
+            if pygame.display.get_surface() is not None:
+                frames = [frame.convert_alpha() for frame in frames]
+            flipped = [pygame.transform.flip(frame, True, False) for frame in frames]
+            entry = AtlasEntry(frames, flipped)
+            self.entries[key] = entry
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+
+
+ATLAS = SpriteAtlas()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep stdout pure JSON
+import pygame
+from settings import ENEMY_HEIGHT, ENEMY_WIDTH, FPS, LEVEL_WIDTH, WINDOW_WIDTH, WINDOW_HEIGHT
+from headless import HeadlessRunner, SCRIPTS
+from layout import ENEMY_KINDS, EnemyRecord
+from level import MovingPlatform
+import enemy_system
+from enemy_system import EnemySystem
+
+BENCH_LIVES = 10 ** 9  # The update run must never hit game over, or the step count would depend on gameplay
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+    }
+
+
+def count_entities(game):
+    return {
+        "platforms": len(game.platforms),
+        "coins": len(game.coins),
+        "enemies": len(game.enemies),
+        "powerup_boxes": len(game.powerup_boxes),
+        "background": len(game.background),
+        "midground": len(game.midground),
+        "all_sprites": len(game.all_sprites),
+    }
+
+
+def bench_generation(game, worlds, repeats):
+    results = []
+    for world in worlds:
+        game.level_number = world
+        difficulty = game.get_difficulty_profile()
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            game.level_generator.generate_level(difficulty, *game.world_rngs(world))
+            samples.append(time.perf_counter() - start)
+        game.generate_new_level()
+        result = {"world": world, "difficulty": difficulty, "entities": count_entities(game)}
+        result.update(summarize(samples))
+        results.append(result)
+    return results
+
+
+def bench_update(game, world, frames, script):
+    game.start_run()
+    game.level_number = world
+    game.generate_new_level()
+    game.player.lives = BENCH_LIVES
+    entities = count_entities(game)
+    runner = HeadlessRunner(game, script)
+    samples = []
+    while runner.frames < frames:
+        start = time.perf_counter()
+        runner.step()
+        samples.append(time.perf_counter() - start)
+    result = {
+        "world": world,
+        "frames": len(samples),
+        "gameplay_frames": game.sim_clock.frame,  # Steps spent on a level-up screen are not simulated
+        "deaths": sum(game.player.deaths.values()),
+        "entities": entities,
+    }
+    result.update(summarize(samples))
+    return result
+
+
+def bench_render(game, world, frames):
+    game.start_run()
+    game.level_number = world
+    game.generate_new_level()
+    game.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    camera = game.camera
+    samples = []
+    drawn = culled = 0
+    for frame in range(frames):
+        # Sweep the camera across the whole level so every chunk gets drawn
+        camera.camera.x = -int((LEVEL_WIDTH - WINDOW_WIDTH) * frame / max(1, frames - 1))
+        camera.visible_rects.clear()
+        start = time.perf_counter()
+        game.draw_gameplay()
+        samples.append(time.perf_counter() - start)
+        drawn += camera.drawn_sprites
+        culled += camera.culled_sprites
+    result = {
+        "world": world,
+        "frames": frames,
+        "entities": count_entities(game),
+        "avg_drawn_sprites": drawn / frames,
+        "avg_culled_sprites": culled / frames,
+    }
+    result.update(summarize(samples))
+    return result
+
+
+def crowd_layout(layout, count):
+    """``layout`` with ``count`` enemies spread over its static platforms, cycling through the kinds."""
+    tops = [record for record in layout.platforms if not record.moving]
+    enemies = []
+    for index in range(count):
+        top = tops[index % len(tops)]
+        x = top.x + (index // len(tops) * ENEMY_WIDTH) % max(1, top.w - ENEMY_WIDTH)
+        kind = index % len(ENEMY_KINDS)
+        y = top.y - ENEMY_HEIGHT - (100 if ENEMY_KINDS[kind] == "flyer" else 0)
+        enemies.append(EnemyRecord(kind, x, y))
+    return layout._replace(enemies=enemies)
+
+
+def bench_enemies(game, world, counts, frames):
+    """Per-frame enemy simulation cost of the sprite path and the EnemySystem batch at synthetic crowd sizes.
+
+    Generated worlds stay well below the batch's break-even point, so this
+    packs extra enemies into the bench world's layout to show where it pays off.
+    """
+    game.start_run()
+    layout = game.plan_world(world)
+    results = []
+    for count in counts:
+        result = {"enemies": count}
+        for path in ("sprites", "batch"):
+            ai_rng = game.world_rngs(world)[1]
+            built = game.level_generator.build_level(crowd_layout(layout, count), ai_rng)
+            platforms, enemies, game.platform_index = built[2], built[4], built[8]
+            game.entities.clear()
+            game.entities.add(platforms, "platforms")
+            moving = [sprite for sprite in platforms if isinstance(sprite, MovingPlatform)]
+            if path == "batch":
+                step = EnemySystem(game, enemies, ai_rng).step
+            else:
+                sprites = enemies.sprites()
+
+                def step():
+                    for sprite in sprites:
+                        sprite.update()
+            samples = []
+            for _ in range(frames):
+                game.sim_clock.tick()
+                for mover in moving:
+                    mover.update()
+                start = time.perf_counter()
+                step()
+                samples.append(time.perf_counter() - start)
+            result[f"{path}_us"] = sum(samples) / len(samples) * 1e6
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark level generation, simulation and rendering headlessly.")
+    parser.add_argument("--worlds", type=int, default=30, help="Benchmark generation for worlds 1..N")
+    parser.add_argument("--repeats", type=int, default=3, help="Generation runs per world")
+    parser.add_argument("--update-frames", type=int, default=FPS * 30, help="update_gameplay steps to time")
+    parser.add_argument("--render-frames", type=int, default=FPS * 5, help="draw_gameplay calls to time")
+    parser.add_argument("--bench-world", type=int, default=10, help="World used for the update and render runs")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="run-right", help="Scripted input for the update run")
+    parser.add_argument("--seed", type=int, default=0, help="Run seed so runs are comparable")
+    parser.add_argument("--enemy-counts", default="8,16,32,64,128",
+                        help="Comma-separated crowd sizes for the sprite vs batch enemy comparison (needs numpy)")
+    parser.add_argument("--enemy-frames", type=int, default=FPS * 10, help="Frames per enemy crowd size and path")
+    parser.add_argument("--output", metavar="PATH", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    from main import Game
+    game = Game(headless=True, seed=args.seed)
+    game.start_run()
+
+    report = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "seed": args.seed,
+        "generation": bench_generation(game, range(1, args.worlds + 1), args.repeats),
+        "update": bench_update(game, args.bench_world, args.update_frames, SCRIPTS[args.script]),
+        "render": bench_render(game, args.bench_world, args.render_frames),
+    }
+    if enemy_system.available():
+        counts = [int(count) for count in args.enemy_counts.split(",") if count.strip()]
+        report["enemy_batch_min"] = enemy_system.BATCH_MIN_ENEMIES
+        report["enemies"] = bench_enemies(game, args.bench_world, counts, args.enemy_frames)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import math
+from collections import deque
+import pygame
+from settings import *
+from powerups import FinalBox
+from coin_field import CoinField
+
+# A headless policy that plays for the clear condition: the final box only
+# opens once every enemy is stomped and every coin and box collected, so the
+# bot walks the platform graph from target to target instead of just running
+# right. Jumps and drops are checked by simulating the player's own per-frame
+# movement against the platform index before committing to them.
+
+JUMP_SPEED = -JUMP_POWER_RUNNING
+MAX_RISE = JUMP_SPEED ** 2 / (2 * GRAVITY) - 12
+
+
+def targets(game):
+    """Rects still needed to open the final box, or the final box itself once it is open."""
+    rects = [enemy.rect for enemy in game.enemies if enemy.rect.top < LEVEL_HEIGHT]
+    coins = game.coins
+    if isinstance(coins, CoinField):
+        width, height = coins.size
+        rects += [pygame.Rect(int(x), int(y), width, height)
+                  for x, y in zip(coins.x[coins.alive], coins.y[coins.alive])]
+    else:
+        rects += [coin.rect for coin in coins]
+    rects += [box.rect for box in game.powerup_boxes if box.has_powerup and not isinstance(box, FinalBox)]
+    if not rects and game.final_box is not None:
+        rects.append(game.final_box.rect)
+    return rects
+
+
+def air_frames(height):
+    """Frames a running jump spends above ``height`` pixels over its takeoff."""
+    return (JUMP_SPEED + math.sqrt(max(0.0, JUMP_SPEED ** 2 - 2 * GRAVITY * height))) / GRAVITY
+
+
+def gap_between(a, b):
+    return max(0, b.left - a.right, a.left - b.right)
+
+
+def can_reach(a, b):
+    """Rough test of whether a running jump from platform ``a`` lands on platform ``b``."""
+    rise = a.top - b.top
+    if rise > MAX_RISE:
+        return False
+    if rise > 0 and gap_between(a, b) == 0:
+        return a.left < b.left - TILE_SIZE * 2 or a.right > b.right + TILE_SIZE * 2
+    return gap_between(a, b) <= PLAYER_RUN_SPEED * air_frames(max(rise, 0) + 8) - PLAYER_WIDTH
+
+
+def landing(game, rect, vel_x, vel_y, direction, aim=None, frames=120):
+    """Platform rect the player lands on holding ``direction`` (-1, 0, 1) while running, or None if they fall out.
+
+    With ``aim`` the simulated player steers for the middle of that rect once above it.
+    """
+    index = game.platform_index
+    box = rect.copy()
+    airborne = False
+    for _ in range(frames):
+        if aim is not None and airborne and box.bottom <= aim.top:
+            if aim.left <= box.left and box.right <= aim.right:
+                direction = 0
+            else:
+                direction = 1 if aim.centerx > box.centerx else -1
+        vel_y += GRAVITY
+        if direction:
+            vel_x = max(-PLAYER_RUN_SPEED, min(PLAYER_RUN_SPEED, vel_x + PLAYER_RUN_ACCELERATION * direction))
+        elif vel_x:
+            vel_x = math.copysign(max(0.0, abs(vel_x) - PLAYER_RUN_DECELERATION), vel_x)
+        box.x += vel_x
+        hits = index.query(box)
+        if hits:
+            if vel_x > 0:
+                box.right = hits[0].rect.left
+            elif vel_x < 0:
+                box.left = hits[0].rect.right
+        box.y += vel_y
+        hits = index.query(box)
+        if not hits:
+            airborne = True
+        elif vel_y > 0:
+            if airborne:
+                return hits[0].rect
+            box.bottom = hits[0].rect.top  # Still walking along the floor we started on
+            vel_y = 0
+        else:
+            box.top = hits[0].rect.bottom
+            vel_y = 0
+        if box.top > LEVEL_HEIGHT:
+            return None
+    return None
+
+
+def enemy_near(game, area):
+    return any(area.colliderect(enemy.rect) for enemy in game.enemies)
+
+
+class CollectBot:
+    """Script for HeadlessRunner that hunts down enemies, coins and boxes, then the final box."""
+
+    def __init__(self):
+        self.game = None
+        self.next = None
+
+    def reset(self, game):
+        self.game = game
+        self.platform = None
+        self.planned = -1
+        self.next = None
+        self.target = None
+        self.air_frame = -10
+        self.runup = None  # (platform, direction, until frame) while backing off for a run-up
+        self.air_keys = ((), ())
+
+    def standing_on(self, game):
+        rect = game.player.rect
+        feet = pygame.Rect(rect.left + 2, rect.bottom, rect.width - 4, 2)
+        hits = game.platform_index.query(feet)
+        return hits[0].rect if hits else None
+
+    def holder(self, game, rect):
+        below = pygame.Rect(rect.x, rect.bottom - 4, rect.width, LEVEL_HEIGHT)
+        hits = [p.rect for p in game.platform_index.query(below) if p.rect.top >= rect.bottom - 4]
+        return min(hits, key=lambda r: r.top) if hits else None
+
+    def plan(self, game, start):
+        """Breadth-first hop counts from ``start`` and the first platform on each route."""
+        rects = [p.rect for p in game.platforms]
+        first = {id(start): None}
+        hops = {id(start): 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for other in rects:
+                if id(other) not in hops and can_reach(node, other):
+                    hops[id(other)] = hops[id(node)] + 1
+                    first[id(other)] = first[id(node)] or other
+                    queue.append(other)
+        return hops, first
+
+    def __call__(self, frame, game):
+        if game is not self.game or frame == 0:
+            self.reset(game)
+        player = game.player
+        rect = player.rect
+        goals = targets(game)
+        if not goals:
+            return (pygame.K_RIGHT, pygame.K_LSHIFT), ()
+        here = self.standing_on(game) if player.on_ground else None
+        if here is not None:
+            if here is not self.platform or frame - self.planned >= 15:
+                self.platform = here
+                self.planned = frame
+                self.hops, self.first = self.plan(game, here)
+            best = None
+            for goal in goals:
+                holder = self.holder(game, goal)
+                key = id(holder) if holder is not None else None
+                cost = (self.hops.get(key, 99), abs(goal.centerx - rect.centerx))
+                if best is None or cost < best[0]:
+                    best = (cost, goal, self.first.get(key))
+            cost, self.target, self.next = best
+            if cost[0] == 99:
+                self.next = None
+            if self.next is None:
+                return self.walk_to(game, self.target)
+            return self.hop_to(game, self.next, here)
+        return self.steer_air(game)
+
+    def keys(self, direction):
+        if direction > 0:
+            return (pygame.K_RIGHT, pygame.K_LSHIFT)
+        if direction < 0:
+            return (pygame.K_LEFT, pygame.K_LSHIFT)
+        return ()
+
+    def walk_to(self, game, target):
+        player = game.player
+        rect = player.rect
+        dx = target.centerx - rect.centerx
+        if abs(dx) < 4:
+            return (), ((pygame.K_SPACE,) if target.bottom < rect.top else ())
+        direction = 1 if dx > 0 else -1
+        held = self.keys(direction) if abs(dx) > TILE_SIZE else ((pygame.K_RIGHT,) if dx > 0 else (pygame.K_LEFT,))
+        zone = pygame.Rect(rect.right if dx > 0 else rect.left - TILE_SIZE * 2, rect.top - TILE_SIZE,
+                           TILE_SIZE * 2, rect.height + TILE_SIZE)
+        if enemy_near(game, zone) or (target.bottom < rect.top - 4 and abs(dx) < TILE_SIZE):
+            return held, (pygame.K_SPACE,)
+        ahead = pygame.Rect(rect.centerx + direction * PLAYER_RUN_SPEED * 2, rect.bottom, 4, 4)
+        if not game.platform_index.any(ahead) and landing(game, rect, player.vel_x, 0, direction) is None:
+            if landing(game, rect, player.vel_x, JUMP_POWER_RUNNING, direction) is not None:
+                return held, (pygame.K_SPACE,)
+            return self.keys(-direction), ()
+        return held, ()
+
+    def hop_to(self, game, nxt, here):
+        player = game.player
+        rect = player.rect
+        if self.runup is not None:
+            platform, direction, until = self.runup
+            room = (rect.left - here.left) if direction < 0 else (here.right - rect.right)
+            if platform is here and game.sim_clock.frame < until and room > 4:
+                return self.keys(direction), ()
+            self.runup = None
+        rise = here.top - nxt.top
+        if gap_between(here, nxt) == 0 and rise > 0:
+            # Stacked: take off from the side where ``here`` sticks out past ``nxt``
+            side = -1 if nxt.left - here.left > here.right - nxt.right else 1
+            toward = -side
+            if rect.right > nxt.left and rect.left < nxt.right:
+                return self.keys(side), ()
+        else:
+            toward = 1 if nxt.centerx > rect.centerx else -1
+        gap = (nxt.left - rect.right) if toward > 0 else (rect.left - nxt.right)
+        zone = pygame.Rect(rect.right if toward > 0 else rect.left - TILE_SIZE * 2, rect.top - TILE_SIZE,
+                           TILE_SIZE * 2, rect.height + TILE_SIZE)
+        if enemy_near(game, zone):
+            return self.keys(toward), (pygame.K_SPACE,)
+        if rise > 8 and self.guarded(game, nxt, toward):
+            room = (rect.left - here.left) if toward > 0 else (here.right - rect.right)
+            return (self.keys(-toward) if gap < TILE_SIZE * 3 and room > TILE_SIZE else ()), ()
+        if rise >= -8 and landing(game, rect, player.vel_x, JUMP_POWER_RUNNING, toward, nxt) is nxt:
+            return self.keys(toward), (pygame.K_SPACE,)
+        ahead = pygame.Rect(rect.centerx + toward * PLAYER_RUN_SPEED * 2, rect.bottom, 4, 4)
+        if not game.platform_index.any(ahead):
+            # About to run out of floor without a jump that reaches ``nxt``
+            if landing(game, rect, player.vel_x, 0, toward, nxt) is nxt:
+                return self.keys(toward), ()
+            if landing(game, rect, player.vel_x, JUMP_POWER_RUNNING, toward, nxt) is nxt:
+                return self.keys(toward), (pygame.K_SPACE,)
+            room = (rect.left - here.left) if toward > 0 else (here.right - rect.right)
+            if room > TILE_SIZE * 2:
+                # Back off and come at the edge again at full speed
+                self.runup = (here, -toward, game.sim_clock.frame + 14)
+                return self.keys(-toward), ()
+            if landing(game, rect, player.vel_x, JUMP_POWER_RUNNING, toward) is not None:
+                return self.keys(toward), (pygame.K_SPACE,)
+            return self.keys(-toward), ()
+        speed = player.vel_x * toward
+        room = (rect.left - here.left) if toward > 0 else (here.right - rect.right)
+        if rise > 8 and speed < 5 and gap < TILE_SIZE * 3 and room > TILE_SIZE:
+            # Too slow to make the climb: back off for a run-up
+            self.runup = (here, -toward, game.sim_clock.frame + 10)
+            return self.keys(-toward), ()
+        return self.keys(toward), ()
+
+    def guarded(self, game, nxt, toward):
+        """Whether an enemy on ``nxt`` is near, or heading for, the edge we would land on."""
+        edge = nxt.left if toward > 0 else nxt.right
+        for enemy in game.enemies:
+            rect = enemy.rect
+            if not (nxt.top - ENEMY_HEIGHT * 2 <= rect.bottom <= nxt.top + 4 and nxt.left - 8 <= rect.centerx <= nxt.right + 8):
+                continue
+            distance = abs(rect.centerx - edge)
+            heading = getattr(enemy, "direction", 0) * toward < 0
+            if distance < TILE_SIZE * 2.5 or (heading and distance < TILE_SIZE * 4):
+                return True
+        return False
+
+    def steer_air(self, game):
+        """Air control, re-decided every few frames since each choice simulates the rest of the fall."""
+        if game.sim_clock.frame - self.air_frame < 4:
+            return self.air_keys
+        self.air_frame = game.sim_clock.frame
+        self.air_keys = self.choose_air(game)
+        return self.air_keys
+
+    def choose_air(self, game):
+        player = game.player
+        rect = player.rect
+        choices = [1 if player.vel_x >= 0 else -1, 0, -1 if player.vel_x >= 0 else 1]
+        nxt = self.next
+        if nxt is not None:
+            toward = 1 if nxt.centerx > rect.centerx else -1
+            choices.insert(0, toward)
+            for direction in choices:
+                if landing(game, rect, player.vel_x, player.vel_y, direction, nxt) is nxt:
+                    return self.keys(direction), ()
+        for direction in choices:
+            if landing(game, rect, player.vel_x, player.vel_y, direction) is not None:
+                return self.keys(direction), ()
+        return self.keys(choices[0]), ()
@@ -3,13 +3,21 @@ from settings import WINDOW_WIDTH, WINDOW_HEIGHT
 
 class Camera:
     def __init__(self, level_width, level_height):
-        self.camera = pygame.Rect(0, 0, level_width, level_height)
+        """``level_width`` None scrolls right without limit (endless mode)."""
+        self.camera = pygame.Rect(0, 0, level_width or WINDOW_WIDTH, level_height)
         self.width = level_width
         self.height = level_height
+        self.left = 0  # World x the view may not scroll past; endless mode raises it as chunks retire
+        self.visible_rects = {}  # World-space view rect per parallax factor, rebuilt on update
+        self.drawn_sprites = 0
+        self.culled_sprites = 0
 
     def apply(self, entity):
         return entity.rect.move(self.camera.topleft)
 
+    def apply_rect(self, rect):
+        return rect.move(self.camera.topleft)
+
     def apply_parallax(self, entity, parallax_factor):
         """Apply camera offset with parallax effect.
 
@@ -23,14 +31,37 @@ class Camera:
         parallax_y = int(self.camera.y * parallax_factor)
         return entity.rect.move(parallax_x, parallax_y)
 
+    def visible_rect(self, parallax_factor=1.0):
+        """World-space rect that lands on screen for sprites with this parallax factor."""
+        rect = self.visible_rects.get(parallax_factor)
+        if rect is None:
+            rect = pygame.Rect(-int(self.camera.x * parallax_factor), -int(self.camera.y * parallax_factor),
+                               WINDOW_WIDTH, WINDOW_HEIGHT)
+            self.visible_rects[parallax_factor] = rect
+        return rect
+
+    def is_visible(self, rect, parallax_factor=1.0):
+        """Cull test used by the draw layers; also feeds the drawn/culled counters."""
+        if rect.colliderect(self.visible_rect(parallax_factor)):
+            self.drawn_sprites += 1
+            return True
+        self.culled_sprites += 1
+        return False
+
+    def reset_cull_stats(self):
+        self.drawn_sprites = 0
+        self.culled_sprites = 0
+
     def update(self, target):
         x = -target.rect.centerx + WINDOW_WIDTH // 2
         y = -target.rect.centery + WINDOW_HEIGHT // 2
 
         # Limit scrolling to level size
-        x = min(0, x)  # left
+        x = min(-self.left, x)  # left
         y = min(0, y)  # top
-        x = max(-(self.width - WINDOW_WIDTH), x)  # right
+        if self.width is not None:
+            x = max(-(self.width - WINDOW_WIDTH), x)  # right
         y = max(-(self.height - WINDOW_HEIGHT), y)  # bottom
 
-        self.camera = pygame.Rect(x, y, self.width, self.height)
\ No newline at end of file
+        self.camera = pygame.Rect(x, y, self.width or WINDOW_WIDTH, self.height)
+        self.visible_rects.clear()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy coins stay individual Coin sprites
+    np = None
+
+
+def available():
+    return np is not None
+
+
+class CoinField:
+    """Every coin of a world held as arrays instead of sprites.
+
+    Coins all bob in phase (see ``Coin.update``), so one sine per frame gives
+    the offset for the whole field; collection is a single vectorized overlap
+    test against the player rect. ``len()`` counts uncollected coins, like the
+    sprite group it replaces.
+    """
+
+    def __init__(self, records, image):
+        self.image = image
+        self.size = image.get_width(), image.get_height()
+        self.x = np.array([record.x for record in records], dtype=np.int32)
+        self.y = np.array([record.y for record in records], dtype=np.int32)
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.remaining = len(self.x)
+        self.float_offset = 0
+        self.float_speed = 0.1
+        self.bob = 0
+
+    def __len__(self):
+        return self.remaining
+
+    def update(self):
+        self.float_offset = (self.float_offset + self.float_speed) % (2 * math.pi)
+        # Same pixel snap as assigning original_y + sin * 5 to rect.y (all y are positive)
+        self.bob = math.floor(math.sin(self.float_offset) * 5 + 0.5)
+
+    def overlapping(self, rect):
+        """Mask of uncollected coins whose rect overlaps ``rect``."""
+        width, height = self.size
+        y = self.y + self.bob
+        return (self.alive & (self.x < rect.right) & (self.x + width > rect.left) &
+                (y < rect.bottom) & (y + height > rect.top))
+
+    def collect(self, rect):
+        """Remove the coins touching ``rect`` and return how many there were."""
+        hits = self.overlapping(rect)
+        count = int(np.count_nonzero(hits))
+        if count:
+            self.alive[hits] = False
+            self.remaining -= count
+        return count
+
+    def merge(self, other):
+        """Take over another field's uncollected coins (endless mode adds a field per chunk)."""
+        keep = other.alive
+        self.x = np.concatenate([self.x, other.x[keep]])
+        self.y = np.concatenate([self.y, other.y[keep]])
+        self.alive = np.concatenate([self.alive, keep[keep]])
+        self.remaining += other.remaining
+
+    def retire(self, left):
+        """Forget every coin lying entirely left of world x ``left``."""
+        keep = self.x + self.size[0] >= left
+        self.remaining -= int(np.count_nonzero(self.alive & ~keep))
+        self.x = self.x[keep]
+        self.y = self.y[keep]
+        self.alive = self.alive[keep]
+
+    def draw(self, surface, camera):
+        if not self.remaining:
+            return
+        visible = self.overlapping(camera.visible_rect())
+        count = int(np.count_nonzero(visible))
+        camera.drawn_sprites += count
+        camera.culled_sprites += self.remaining - count
+        if not count:
+            return
+        offset_x, offset_y = camera.camera.topleft
+        xs = (self.x[visible] + offset_x).tolist()
+        ys = (self.y[visible] + (self.bob + offset_y)).tolist()
+        image = self.image
+        surface.blits([(image, position) for position in zip(xs, ys)], False)
@@ -0,0 +1,233 @@
+import argparse
+import struct
+import time
+import zlib
+
+import pygame
+
+# Keys that gameplay and the menus react to; a frame's held keys are stored as a
+# bitmask over this tuple and pressed keys as indices into it, so the order is
+# part of the replay format.
+CONTROL_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_SPACE, pygame.K_RETURN, pygame.K_LSHIFT, pygame.K_RSHIFT,
+    pygame.K_x, pygame.K_r,
+)
+KEY_INDEX = {key: index for index, key in enumerate(CONTROL_KEYS)}
+
+# Replay log: a header, then run-length encoded frames. Each entry is
+# (frame count, held mask, pressed count) followed by one byte per pressed key.
+# Zero-count entries are markers: END is followed by the trailer, NEW_RUN by
+# the seed of a run started during the next frame.
+REPLAY_MAGIC = b"ULRP"
+REPLAY_FORMAT_VERSION = 2  # 2: NEW_RUN markers, since every run draws its own seed
+REPLAY_SUFFIX = ".ulrp"
+HEADER = struct.Struct("<4sHqIB")  # magic, version, current run seed, start world, start state
+ENTRY = struct.Struct("<HHB")
+SEED = struct.Struct("<q")
+TRAILER = struct.Struct("<II")  # frames, fingerprint of the final state
+END, NEW_RUN = 0, 1  # Pressed-count field of a zero-count entry
+START_STATES = ("title", "playing")
+MAX_RUN = 0xFFFF
+
+
+class ReplayFormatError(ValueError):
+    pass
+
+
+class KeyState:
+    """Held keys decoded from a bitmask; indexable like ``pygame.key.get_pressed()``."""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        index = KEY_INDEX.get(key)
+        return index is not None and bool(self.mask >> index & 1)
+
+
+def held_mask(key_state):
+    """Bitmask of the control keys held in any ``get_pressed``-style key state."""
+    mask = 0
+    for index, key in enumerate(CONTROL_KEYS):
+        if key_state[key]:
+            mask |= 1 << index
+    return mask
+
+
+def state_fingerprint(game):
+    """CRC of the state a replay has to reproduce exactly."""
+    player = game.player
+    values = [game.sim_clock.frame, game.state, game.level_number]
+    if player:
+        values += [player.score, player.lives, player.level, player.xp, player.rect.topleft,
+                   player.vel_x, player.vel_y, len(game.enemies), len(game.coins)]
+    return zlib.crc32(repr(values).encode())
+
+
+class InputRecorder:
+    """Writes every frame's input to a replay log as the game runs.
+
+    Attach with ``game.recorder = InputRecorder(path, game)`` before the first
+    frame; ``Game.apply_input`` feeds it, ``Game.start_run`` logs each new run's
+    seed, and ``close`` stores the frame count and a fingerprint of the final
+    state so a replay can verify itself.
+    """
+
+    def __init__(self, path, game):
+        if game.state not in START_STATES:
+            raise ValueError(f"cannot start recording in state '{game.state}'")
+        # The header only stores the seed and start point, so a replay always rebuilds worlds with plan_level
+        if game.endless:
+            raise ValueError("endless runs cannot be recorded; the log format has no mode field")
+        if game.level_pack or game.world_cache:
+            raise ValueError("runs using a level pack or world cache cannot be recorded; "
+                             "replays regenerate every world from the seed")
+        self.path = path
+        self.handle = open(path, "wb")
+        self.handle.write(HEADER.pack(REPLAY_MAGIC, REPLAY_FORMAT_VERSION, game.rng.seed, game.level_number,
+                                      START_STATES.index(game.state)))
+        self.frames = 0
+        self.run_mask = 0
+        self.run_length = 0
+
+    def record(self, key_state, pressed):
+        self.frames += 1
+        mask = held_mask(key_state)
+        indices = bytes(KEY_INDEX[key] for key in pressed if key in KEY_INDEX)
+        if not indices and mask == self.run_mask and 0 < self.run_length < MAX_RUN:
+            self.run_length += 1
+            return
+        self.flush_run()
+        if indices:
+            self.handle.write(ENTRY.pack(1, mask, len(indices)) + indices)
+        else:
+            self.run_mask = mask
+            self.run_length = 1
+
+    def start_run(self, game):
+        self.flush_run()
+        self.handle.write(ENTRY.pack(0, 0, NEW_RUN) + SEED.pack(game.rng.seed))
+
+    def flush_run(self):
+        if self.run_length:
+            self.handle.write(ENTRY.pack(self.run_length, self.run_mask, 0))
+            self.run_length = 0
+
+    def close(self, game):
+        if self.handle is None:
+            return
+        self.flush_run()
+        self.handle.write(ENTRY.pack(0, 0, END))
+        self.handle.write(TRAILER.pack(self.frames, state_fingerprint(game)))
+        self.handle.close()
+        self.handle = None
+
+
+class ReplayLog:
+    """A parsed replay log; ``frames()`` yields ``(KeyState, pressed_keys)`` per frame.
+
+    ``run_seed`` follows the NEW_RUN markers as ``frames()`` advances: it is the
+    seed any run started during the frame just yielded has to use.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            self.data = handle.read()
+        if len(self.data) < HEADER.size:
+            raise ReplayFormatError(f"{path}: truncated header")
+        magic, version, self.seed, self.world, state = HEADER.unpack_from(self.data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ReplayFormatError(f"{path}: not a replay log")
+        if version != REPLAY_FORMAT_VERSION:
+            raise ReplayFormatError(f"{path}: unsupported replay version {version}")
+        self.path = path
+        self.start_state = START_STATES[state]
+        self.run_seed = self.seed
+        self.frame_count = None  # Trailer values; None if the recording was cut short
+        self.fingerprint = None
+
+    def frames(self):
+        data = self.data
+        offset = HEADER.size
+        while offset + ENTRY.size <= len(data):
+            count, mask, pressed_count = ENTRY.unpack_from(data, offset)
+            offset += ENTRY.size
+            if count == 0:
+                if pressed_count == NEW_RUN:
+                    if offset + SEED.size > len(data):
+                        return
+                    self.run_seed, = SEED.unpack_from(data, offset)
+                    offset += SEED.size
+                    continue
+                if offset + TRAILER.size <= len(data):
+                    self.frame_count, self.fingerprint = TRAILER.unpack_from(data, offset)
+                return
+            pressed = tuple(CONTROL_KEYS[index] for index in data[offset:offset + pressed_count])
+            offset += pressed_count
+            key_state = KeyState(mask)
+            yield key_state, pressed
+            for _ in range(count - 1):
+                yield key_state, ()
+
+
+def start_replay(game, log):
+    """Put a freshly created game into the state the recording started from."""
+    if log.start_state == "playing":
+        game.start_run()
+        if log.world != game.level_number:
+            game.level_number = log.world
+            game.generate_new_level()
+
+
+def replay(game, log, profile=False):
+    """Drive ``game`` through the logged frames as fast as possible, like ``Game.run`` without drawing."""
+    profiler = game.profiler
+    frames = 0
+    for key_state, pressed in log.frames():
+        if profile:
+            profiler.begin_frame()
+        game.seed = log.run_seed  # Pin the recorded seed for any run this frame starts
+        game.apply_input(key_state, pressed)
+        if game.state == "playing":
+            game.update_gameplay()
+        if profile:
+            profiler.end_frame()
+        frames += 1
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded UltraLorenzo run headlessly.")
+    parser.add_argument("log", help="Replay log written with --record")
+    parser.add_argument("--profile-csv", metavar="PATH", help="Write per-frame section timings to a CSV file")
+    args = parser.parse_args()
+
+    from main import Game
+    log = ReplayLog(args.log)
+    game = Game(headless=True, seed=log.seed)
+    if args.profile_csv:
+        game.profiler.open_csv(args.profile_csv)
+    start_replay(game, log)
+
+    start = time.perf_counter()
+    frames = replay(game, log, profile=bool(args.profile_csv))
+    elapsed = time.perf_counter() - start
+    game.profiler.close_csv()
+
+    print(f"Replayed {frames} frames in {elapsed:.2f}s (seed {log.seed}, ended on world {game.level_number} "
+          f"in state '{game.state}')")
+    if log.fingerprint is None:
+        print("Recording has no trailer; final state not verified")
+    elif frames == log.frame_count and state_fingerprint(game) == log.fingerprint:
+        print("Final state matches the recording")
+    else:
+        print("Final state DIVERGED from the recording")
+        raise SystemExit(1)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+from collections import deque
+
+from settings import *
+from atlas import ATLAS
+from coin_field import CoinField
+from layout import CHUNK_WIDTH, ENDLESS_START, THEMES, generate_chunk
+from level import Cloud, Coin, Hill, Mountain, MovingPlatform
+from prefetch import LevelPrefetcher
+from spatial import SpatialHash
+from static_layer import LayerGroup
+import coin_field
+
+# Endless mode: instead of one LEVEL_WIDTH world built up front, gameplay is
+# laid out in CHUNK_WIDTH slices just ahead of the camera and torn down once
+# they are well behind it, so sprite groups, the platform index and the baked
+# terrain stay the same size however far the player runs. Backdrops stream the
+# same way, independently in each parallax layer's own coordinates.
+
+STREAM_MARGIN = CHUNK_WIDTH  # Keep this much world built past each edge of the view
+
+
+class Chunk:
+    """Everything one chunk added to the world, so it can be removed again."""
+
+    def __init__(self, index, right, platforms, sprites, terrain_layer):
+        self.index = index
+        self.right = right  # Furthest x any of its platforms reach
+        self.platforms = platforms
+        self.sprites = sprites  # Moving platforms, boxes and coin sprites; enemies are retired by position
+        self.terrain_layer = terrain_layer
+
+
+class Backdrop:
+    """One parallax layer of scenery spawned ahead of the view and dropped behind it.
+
+    ``spawn(x, rng)`` returns ``(sprite, next_x)`` in the layer's own parallax
+    coordinates; sprites are registered in the entity set ``name``.
+    """
+
+    def __init__(self, entities, name, parallax_factor, spawn, start_x, rng):
+        self.entities = entities
+        self.name = name
+        self.parallax_factor = parallax_factor
+        self.spawn = spawn
+        self.next_x = start_x
+        self.rng = rng
+        self.sprites = deque()
+
+    def update(self, camera):
+        view = camera.visible_rect(self.parallax_factor)
+        while self.next_x < view.right + STREAM_MARGIN:
+            sprite, self.next_x = self.spawn(self.next_x, self.rng)
+            self.entities.add(sprite, self.name)
+            self.sprites.append(sprite)
+        while self.sprites and self.sprites[0].rect.right < view.left - STREAM_MARGIN:
+            self.sprites.popleft().kill()
+
+
+class EndlessWorld:
+    """Streams an endless run into the Game's usual groups and layers.
+
+    Chunk ``n`` covers world x ``n * CHUNK_WIDTH`` onwards and is planned on the
+    prefetch thread while the previous one is on screen; layout and behavior
+    RNG streams are per chunk, so a seed always produces the same world.
+    Difficulty follows ``layout.distance_difficulty``, and ``game.level_number``
+    tracks the distance tier so crossing one still rewards a world clear.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.theme_index = game.rng.stream("endless").randrange(len(THEMES))
+        self.theme = THEMES[self.theme_index]
+        self.chunks = deque()
+        self.next_index = 0
+        self.next_state = ENDLESS_START  # Where chunk ``next_index`` carries on from
+        self.prefetcher = LevelPrefetcher(self.plan_chunk)
+        self.backdrops = []
+
+    def plan_chunk(self, index):
+        """Runs on the prefetch thread: plain data only."""
+        return generate_chunk(index, self.next_state, self.theme_index, self.game.rng.stream("endless", index))
+
+    def start(self):
+        """Reset the game's world state and stream in the opening view."""
+        game = self.game
+        entities = game.entities
+        entities.clear()
+        entities.add(game.player, "sprites")
+        game.platform_index = SpatialHash()
+        game.terrain_layer = LayerGroup()
+        game.overlay_layer = LayerGroup()
+        if coin_field.available():
+            game.coins = CoinField([], ATLAS.get("coin", Coin.create_sprite_frames).frames[0])
+        else:
+            game.coins = entities.group("coins")
+        game.current_theme = self.theme
+        game.final_box = None
+        game.enemy_system = None
+        game.world_left = game.camera.left = 0
+
+        rng = game.rng
+        self.backdrops = [
+            Backdrop(entities, "background", PARALLAX_MOUNTAIN, self.spawn_mountain, 0,
+                     rng.stream("endless-mountains")),
+            Backdrop(entities, "midground", PARALLAX_HILL, self.spawn_hill, -90, rng.stream("endless-hills")),
+            Backdrop(entities, "midground", PARALLAX_CLOUD, self.spawn_cloud, 0, rng.stream("endless-clouds")),
+        ]
+        self.update()
+
+    def spawn_mountain(self, x, rng):
+        width = rng.randint(500, 800)
+        height = rng.randint(280, 420)
+        sprite = Mountain(x, LEVEL_HEIGHT - height, width, height, self.theme["mountain"], self.theme["snow_cap"])
+        return sprite, x + LEVEL_WIDTH // 3
+
+    def spawn_hill(self, x, rng):
+        height = rng.randint(180, 320)
+        return Hill(x, LEVEL_HEIGHT, 600, height, self.theme["hill"]), x + 420
+
+    def spawn_cloud(self, x, rng):
+        y = rng.randint(50, LEVEL_HEIGHT // 2)
+        width = rng.randint(70, 130)
+        height = rng.randint(30, 60)
+        sprite = Cloud(x, y, self.theme["cloud"], width, height, rng.uniform(0.2, 0.5), wrap_width=None)
+        return sprite, x + rng.randint(60, 2 * LEVEL_WIDTH // 12)
+
+    def update(self):
+        """Called once the camera has moved: build ahead, retire behind, ramp the tier."""
+        game = self.game
+        view = game.camera.visible_rect()
+        while self.next_index * CHUNK_WIDTH < view.right + STREAM_MARGIN:
+            self.load_chunk()
+        retired = False
+        while self.chunks and self.chunks[0].right < view.left - STREAM_MARGIN:
+            self.retire_chunk(self.chunks.popleft())
+            retired = True
+        if retired:
+            self.retire_behind(game.world_left)
+        for backdrop in self.backdrops:
+            backdrop.update(game.camera)
+
+        tier = 1 + game.player.rect.centerx // LEVEL_WIDTH
+        if tier > game.level_number:
+            game.on_level_complete()
+
+    def load_chunk(self):
+        game = self.game
+        index = self.next_index
+        plan = self.prefetcher.take(index)
+        if plan is None:
+            plan = self.plan_chunk(index)
+        layout, self.next_state = plan
+        self.next_index += 1
+        self.prefetcher.request(self.next_index)  # Reads next_state, which stays put until taken
+
+        (_, _, platforms, coins, enemies, powerups, _, _, _, terrain_layer, _) = game.level_generator.build_level(
+            layout, game.rng.stream("endless-ai", index), game.platform_index)
+        entities = game.entities
+        sprites = [platform for platform in platforms if isinstance(platform, MovingPlatform)]
+        sprites += powerups.sprites()
+        entities.add(platforms, "platforms")
+        entities.add(sprites, "sprites")
+        entities.add(powerups, "powerup_boxes")
+        if isinstance(game.coins, CoinField):
+            game.coins.merge(coins)
+        else:
+            sprites += coins.sprites()
+            entities.add(coins, "coins", "sprites")
+        entities.add(enemies, "enemies", "sprites")
+        # Keep the player drawn on top of everything streamed in after it
+        entities.bring_to_front(game.player, "sprites")
+        game.terrain_layer.add(terrain_layer)
+
+        right = max([record.max_right for record in layout.platforms] + [(index + 1) * CHUNK_WIDTH])
+        self.chunks.append(Chunk(index, right, platforms.sprites(), sprites, terrain_layer))
+
+    def retire_chunk(self, chunk):
+        game = self.game
+        for platform in chunk.platforms:
+            game.platform_index.remove(platform)
+            platform.kill()
+        for sprite in chunk.sprites:
+            sprite.kill()
+        game.terrain_layer.remove(chunk.terrain_layer)
+        game.world_left = game.camera.left = max(game.world_left, chunk.right)
+
+    def retire_behind(self, left):
+        """Drop the enemies and coins that ended up left of the retired part of the world."""
+        game = self.game
+        for enemy in game.enemies.sprites():
+            if enemy.rect.right < left:
+                enemy.kill()
+        if isinstance(game.coins, CoinField):
+            game.coins.retire(left)
+
+    def spawn_point(self):
+        """Respawn on the last ground segment still loaded at or behind the player."""
+        game = self.game
+        ground_y = LEVEL_HEIGHT - PLATFORM_HEIGHT
+        best = None
+        for platform in game.platforms:
+            if (platform.rect.y == ground_y and not isinstance(platform, MovingPlatform)
+                    and platform.rect.left <= game.player.rect.left
+                    and (best is None or platform.rect.left > best.rect.left)):
+                best = platform
+        if best is None:
+            return game.world_left + PLAYER_SPAWN_X, PLAYER_SPAWN_Y
+        return max(best.rect.left, game.world_left) + 20, PLAYER_SPAWN_Y
+
+    def close(self):
+        self.prefetcher.cancel()
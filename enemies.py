@@ -1,18 +1,19 @@
 import pygame
-import random
 import math
 from settings import *
+from atlas import ATLAS
 
 
 class WalkerEnemy(pygame.sprite.Sprite):
     """Classic ground patroller."""
 
-    def __init__(self, game, x, y, difficulty_scale=1.0):
+    def __init__(self, game, x, y, difficulty_scale, rng):
         super().__init__()
         self.game = game
-        self.create_sprite_frames()
-        self.direction = random.choice([-1, 1])
-        self.image = self.frames[0] if self.direction > 0 else pygame.transform.flip(self.frames[0], True, False)
+        self.rng = rng
+        self.frames, self.flipped_frames = ATLAS.get("walker", self.create_sprite_frames)
+        self.direction = self.rng.choice([-1, 1])
+        self.image = self.frames[0] if self.direction > 0 else self.flipped_frames[0]
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -24,9 +25,10 @@ class WalkerEnemy(pygame.sprite.Sprite):
         self.animation_counter = 0
         self.current_frame = 0
 
-    def create_sprite_frames(self):
+    @staticmethod
+    def create_sprite_frames():
         """Create pixel art Goomba-like enemy"""
-        self.frames = []
+        frames = []
         for i in range(2):
             sprite = pygame.Surface((ENEMY_WIDTH, ENEMY_HEIGHT), pygame.SRCALPHA)
 
@@ -58,7 +60,8 @@ class WalkerEnemy(pygame.sprite.Sprite):
                 pygame.draw.rect(sprite, dark_brown, (4, 26, 6, 6))
                 pygame.draw.rect(sprite, dark_brown, (22, 26, 6, 6))
 
-            self.frames.append(sprite)
+            frames.append(sprite)
+        return frames
 
     def update(self):
         self.rect.x += self.speed * self.direction
@@ -69,7 +72,7 @@ class WalkerEnemy(pygame.sprite.Sprite):
         if self.animation_counter >= 15:
             self.animation_counter = 0
             self.current_frame = (self.current_frame + 1) % 2
-            self.image = self.frames[self.current_frame] if self.direction > 0 else pygame.transform.flip(self.frames[self.current_frame], True, False)
+            self.image = self.frames[self.current_frame] if self.direction > 0 else self.flipped_frames[self.current_frame]
 
         if self.move_counter > 120:
             self.direction *= -1
@@ -78,7 +81,7 @@ class WalkerEnemy(pygame.sprite.Sprite):
         self.vel_y += GRAVITY
         self.rect.y += self.vel_y
 
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platform_index.collide(self)
         if hits:
             if self.vel_y > 0:
                 self.rect.bottom = hits[0].rect.top
@@ -92,11 +95,7 @@ class WalkerEnemy(pygame.sprite.Sprite):
         ahead_check.x += self.speed * self.direction
         ahead_check.y += 5
 
-        has_ground = False
-        for platform in self.game.platforms:
-            if platform.rect.colliderect(ahead_check):
-                has_ground = True
-                break
+        has_ground = self.game.platform_index.any(ahead_check)
 
         if not has_ground:
             self.direction *= -1
@@ -105,10 +104,11 @@ class WalkerEnemy(pygame.sprite.Sprite):
 class HopperEnemy(pygame.sprite.Sprite):
     """Enemy that makes unpredictable hops."""
 
-    def __init__(self, game, x, y, difficulty_scale=1.0):
+    def __init__(self, game, x, y, difficulty_scale, rng):
         super().__init__()
         self.game = game
-        self.create_sprite_frames()
+        self.rng = rng
+        self.frames = ATLAS.get("hopper", self.create_sprite_frames).frames
         self.current_frame = 0
         self.image = self.frames[0]
         self.rect = self.image.get_rect()
@@ -116,15 +116,16 @@ class HopperEnemy(pygame.sprite.Sprite):
         self.rect.y = y
 
         self.vel_y = 0
-        self.direction = random.choice([-1, 1])
+        self.direction = self.rng.choice([-1, 1])
         self.speed = (ENEMY_SPEED - 0.5) * max(0.6, difficulty_scale)
-        self.hop_cooldown = random.randint(30, 90)
+        self.hop_cooldown = self.rng.randint(30, 90)
         self.difficulty_scale = difficulty_scale
         self.animation_counter = 0
 
-    def create_sprite_frames(self):
+    @staticmethod
+    def create_sprite_frames():
         """Create pixel art bouncing slime-like enemy"""
-        self.frames = []
+        frames = []
         for i in range(2):
             sprite = pygame.Surface((ENEMY_WIDTH, ENEMY_HEIGHT), pygame.SRCALPHA)
 
@@ -146,14 +147,15 @@ class HopperEnemy(pygame.sprite.Sprite):
             pygame.draw.circle(sprite, (255, 255, 255), (13, 17), 1)
             pygame.draw.circle(sprite, (255, 255, 255), (21, 17), 1)
 
-            self.frames.append(sprite)
+            frames.append(sprite)
+        return frames
 
     def update(self):
         self.hop_cooldown -= 1
         if self.hop_cooldown <= 0:
             self.vel_y = JUMP_POWER * 0.6
-            self.direction = random.choice([-1, 1])
-            self.hop_cooldown = random.randint(45, 90)
+            self.direction = self.rng.choice([-1, 1])
+            self.hop_cooldown = self.rng.randint(45, 90)
 
         # Animate based on velocity
         self.animation_counter += 1
@@ -169,7 +171,7 @@ class HopperEnemy(pygame.sprite.Sprite):
         self.vel_y += GRAVITY
         self.rect.y += self.vel_y
 
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platform_index.collide(self)
         if hits:
             if self.vel_y > 0:
                 self.rect.bottom = hits[0].rect.top
@@ -178,17 +180,18 @@ class HopperEnemy(pygame.sprite.Sprite):
                 self.rect.top = hits[0].rect.bottom
                 self.vel_y = 0
 
-        if self.rect.left < 0 or self.rect.right > LEVEL_WIDTH:
+        if self.rect.left < 0 or self.rect.right > self.game.level_width:
             self.direction *= -1
 
 
 class FlyerEnemy(pygame.sprite.Sprite):
     """Aerial foe that weaves through the sky."""
 
-    def __init__(self, game, x, y, difficulty_scale=1.0):
+    def __init__(self, game, x, y, difficulty_scale, rng):
         super().__init__()
         self.game = game
-        self.create_sprite_frames()
+        self.rng = rng
+        self.frames, self.flipped_frames = ATLAS.get("flyer", self.create_sprite_frames)
         self.current_frame = 0
         self.image = self.frames[0]
         self.rect = self.image.get_rect()
@@ -196,17 +199,18 @@ class FlyerEnemy(pygame.sprite.Sprite):
         self.rect.y = y
 
         self.base_y = y
-        self.amplitude = random.randint(30, 60)
-        self.wave_offset = random.random() * math.tau
-        self.direction = random.choice([-1, 1])
+        self.amplitude = self.rng.randint(30, 60)
+        self.wave_offset = self.rng.random() * math.tau
+        self.direction = self.rng.choice([-1, 1])
         self.speed = 2.0 * difficulty_scale
         self.min_x = max(50, x - 150)
-        self.max_x = min(LEVEL_WIDTH - 50, x + 150)
+        self.max_x = min(game.level_width - 50, x + 150)
         self.animation_counter = 0
 
-    def create_sprite_frames(self):
+    @staticmethod
+    def create_sprite_frames():
         """Create pixel art bat-like flying enemy"""
-        self.frames = []
+        frames = []
         for i in range(2):
             sprite = pygame.Surface((ENEMY_WIDTH, ENEMY_HEIGHT), pygame.SRCALPHA)
 
@@ -242,7 +246,8 @@ class FlyerEnemy(pygame.sprite.Sprite):
                 # Right wing
                 pygame.draw.polygon(sprite, dark_purple, [(22, 18), (30, 22), (24, 24)])
 
-            self.frames.append(sprite)
+            frames.append(sprite)
+        return frames
 
     def update(self):
         # Animate wing flapping
@@ -250,11 +255,11 @@ class FlyerEnemy(pygame.sprite.Sprite):
         if self.animation_counter >= 8:
             self.animation_counter = 0
             self.current_frame = (self.current_frame + 1) % 2
-            self.image = self.frames[self.current_frame] if self.direction > 0 else pygame.transform.flip(self.frames[self.current_frame], True, False)
+            self.image = self.frames[self.current_frame] if self.direction > 0 else self.flipped_frames[self.current_frame]
 
         self.rect.x += self.direction * self.speed
         if self.rect.left <= self.min_x or self.rect.right >= self.max_x:
             self.direction *= -1
 
-        t = pygame.time.get_ticks() * 0.005
+        t = self.game.sim_clock.ms * 0.005
         self.rect.y = self.base_y + math.sin(t + self.wave_offset) * self.amplitude
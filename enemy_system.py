@@ -0,0 +1,190 @@
+import pygame
+from settings import *
+from enemies import WalkerEnemy, HopperEnemy, FlyerEnemy
+
+try:
+    import numpy as np
+except ImportError:  # The batched system is optional; enemies fall back to per-sprite updates
+    np = None
+
+WALKER, HOPPER, FLYER = 0, 1, 2
+# Below this many enemies the per-sprite updates are cheaper than the batch's fixed NumPy overhead
+# (benchmark.py --enemy-counts: roughly 100 us/frame of fixed cost, break-even near 50 enemies)
+BATCH_MIN_ENEMIES = 48
+ENEMY_KIND_CODES = {WalkerEnemy: WALKER, HopperEnemy: HOPPER, FlyerEnemy: FLYER}
+
+
+def available():
+    return np is not None
+
+
+def _round_rect(values):
+    """Snap like pygame.Rect attribute assignment: round half away from zero."""
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+class EnemyView(pygame.sprite.Sprite):
+    """Render/collision handle for one enemy whose state lives in an EnemySystem."""
+
+    def __init__(self, system, index, enemy):
+        super().__init__()
+        self.system = system
+        self.index = index
+        self.frames = enemy.frames
+        self.flipped_frames = getattr(enemy, "flipped_frames", enemy.frames)
+        self.image = enemy.image
+        self.rect = enemy.rect.copy()
+
+    def update(self):
+        # The first view updated each frame advances the whole batch, keeping the
+        # scalar ordering: after moving platforms, before the player
+        self.system.step_once()
+
+    def kill(self):
+        self.system.alive[self.index] = False
+        super().kill()
+
+
+class EnemySystem:
+    """Struct-of-arrays simulation of every walker, hopper and flyer in a world.
+
+    Positions, velocities, directions and counters are NumPy arrays advanced
+    with batched operations each frame, including ground checks against
+    arrays of platform rects. The per-enemy sprites become EnemyView objects
+    that only carry an image and rect for drawing and player collisions.
+    Behavior follows the scalar ``update`` methods in enemies.py.
+    """
+
+    def __init__(self, game, enemies, rng):
+        self.game = game
+        self.rng = rng
+        sources = list(enemies)
+        count = len(sources)
+
+        self.kind = np.array([ENEMY_KIND_CODES[type(enemy)] for enemy in sources], dtype=np.int8)
+        self.x = np.array([enemy.rect.x for enemy in sources], dtype=np.float64)
+        self.y = np.array([enemy.rect.y for enemy in sources], dtype=np.float64)
+        self.w = np.array([enemy.rect.width for enemy in sources], dtype=np.float64)
+        self.h = np.array([enemy.rect.height for enemy in sources], dtype=np.float64)
+        self.vel_y = np.array([getattr(enemy, "vel_y", 0) for enemy in sources], dtype=np.float64)
+        self.direction = np.array([enemy.direction for enemy in sources], dtype=np.float64)
+        self.speed = np.array([enemy.speed for enemy in sources], dtype=np.float64)
+        self.move_counter = np.array([getattr(enemy, "move_counter", 0) for enemy in sources], dtype=np.int32)
+        self.hop_cooldown = np.array([getattr(enemy, "hop_cooldown", 0) for enemy in sources], dtype=np.int32)
+        self.animation_counter = np.array([enemy.animation_counter for enemy in sources], dtype=np.int32)
+        self.current_frame = np.array([enemy.current_frame for enemy in sources], dtype=np.int8)
+        self.base_y = np.array([getattr(enemy, "base_y", 0) for enemy in sources], dtype=np.float64)
+        self.amplitude = np.array([getattr(enemy, "amplitude", 0) for enemy in sources], dtype=np.float64)
+        self.wave_offset = np.array([getattr(enemy, "wave_offset", 0.0) for enemy in sources], dtype=np.float64)
+        self.min_x = np.array([getattr(enemy, "min_x", 0) for enemy in sources], dtype=np.float64)
+        self.max_x = np.array([getattr(enemy, "max_x", 0) for enemy in sources], dtype=np.float64)
+        self.alive = np.ones(count, dtype=bool)
+        self.stepped_frame = None
+
+        self.views = [EnemyView(self, index, enemy) for index, enemy in enumerate(sources)]
+        self.load_platforms(game.platforms)
+
+    def group(self):
+        return pygame.sprite.Group(self.views)
+
+    def load_platforms(self, platforms):
+        self.platforms = list(platforms)
+        self.px = np.array([p.rect.x for p in self.platforms], dtype=np.float64)
+        self.py = np.array([p.rect.y for p in self.platforms], dtype=np.float64)
+        self.pw = np.array([p.rect.width for p in self.platforms], dtype=np.float64)
+        self.ph = np.array([p.rect.height for p in self.platforms], dtype=np.float64)
+        self.moving_platforms = [(index, p) for index, p in enumerate(self.platforms) if hasattr(p, "travel_distance")]
+
+    def overlaps(self, x, y, w, h):
+        """Boolean matrix (enemies x platforms) of rect overlaps."""
+        return ((x[:, None] < (self.px + self.pw)[None, :]) & ((x + w)[:, None] > self.px[None, :]) &
+                (y[:, None] < (self.py + self.ph)[None, :]) & ((y + h)[:, None] > self.py[None, :]))
+
+    def step_once(self):
+        frame = self.game.sim_clock.frame
+        if frame != self.stepped_frame:
+            self.stepped_frame = frame
+            with self.game.profiler.section("update.enemies"):
+                self.step()
+
+    def step(self):
+        if not self.alive.any():
+            return
+        for index, platform in self.moving_platforms:
+            self.px[index] = platform.rect.x
+
+        alive = self.alive
+        walkers = alive & (self.kind == WALKER)
+        hoppers = alive & (self.kind == HOPPER)
+        flyers = alive & (self.kind == FLYER)
+        grounded = walkers | hoppers
+
+        # Hoppers pick a new hop when their cooldown runs out (RNG drawn in sprite order)
+        self.hop_cooldown[hoppers] -= 1
+        for index in np.flatnonzero(hoppers & (self.hop_cooldown <= 0)):
+            self.vel_y[index] = JUMP_POWER * 0.6
+            self.direction[index] = self.rng.choice([-1, 1])
+            self.hop_cooldown[index] = self.rng.randint(45, 90)
+
+        # Animation ticks
+        self.animation_counter[alive] += 1
+        walker_tick = walkers & (self.animation_counter >= 15)
+        hopper_tick = hoppers & (self.animation_counter >= 10)
+        flyer_tick = flyers & (self.animation_counter >= 8)
+        ticked = walker_tick | hopper_tick | flyer_tick
+        self.animation_counter[ticked] = 0
+        toggled = walker_tick | flyer_tick
+        self.current_frame[toggled] = (self.current_frame[toggled] + 1) % 2
+        self.current_frame[hopper_tick] = np.where(self.vel_y[hopper_tick] < -2, 1, 0)
+        for index in np.flatnonzero(ticked):
+            view = self.views[index]
+            frame = self.current_frame[index]
+            if self.kind[index] == HOPPER or self.direction[index] > 0:
+                view.image = view.frames[frame]
+            else:
+                view.image = view.flipped_frames[frame]
+
+        # Horizontal movement and patrol turns
+        movers = grounded | flyers
+        self.x[movers] = _round_rect(self.x[movers] + self.speed[movers] * self.direction[movers])
+        self.move_counter[walkers] += 1
+        turn = walkers & (self.move_counter > 120)
+        self.direction[turn] *= -1
+        self.move_counter[turn] = 0
+        turn = flyers & ((self.x <= self.min_x) | (self.x + self.w >= self.max_x))
+        self.direction[turn] *= -1
+
+        # Gravity and batched platform collision for ground enemies
+        self.vel_y[grounded] += GRAVITY
+        self.y[grounded] = _round_rect(self.y[grounded] + self.vel_y[grounded])
+        if len(self.platforms):
+            hits = self.overlaps(self.x, self.y, self.w, self.h) & grounded[:, None]
+            has_hit = hits.any(axis=1)
+            first = hits.argmax(axis=1)
+            landing = has_hit & (self.vel_y > 0)
+            self.y[landing] = self.py[first[landing]] - self.h[landing]
+            bonk = has_hit & (self.vel_y < 0)
+            self.y[bonk] = self.py[first[bonk]] + self.ph[first[bonk]]
+            self.vel_y[landing | bonk] = 0
+
+            # Walkers turn around at ledges
+            ahead_x = _round_rect(self.x + self.speed * self.direction)
+            has_ground = self.overlaps(ahead_x, self.y + 5, self.w, self.h).any(axis=1)
+            self.direction[walkers & ~has_ground] *= -1
+        else:
+            self.direction[walkers] *= -1
+
+        out_of_bounds = hoppers & ((self.x < 0) | (self.x + self.w > self.game.level_width))
+        self.direction[out_of_bounds] *= -1
+
+        # Flyers weave along a sine path driven by the simulation clock
+        t = self.game.sim_clock.ms * 0.005
+        self.y[flyers] = _round_rect(self.base_y[flyers] +
+                                     np.sin(t + self.wave_offset[flyers]) * self.amplitude[flyers])
+
+        # Sync the thin views used for drawing and player collisions
+        live = np.flatnonzero(alive)
+        for index, x, y in zip(live.tolist(), self.x[live].tolist(), self.y[live].tolist()):
+            rect = self.views[index].rect
+            rect.x = x
+            rect.y = y
@@ -0,0 +1,105 @@
+import pygame
+
+
+class EntityRegistry:
+    """Owns every gameplay sprite exactly once and the named sets it belongs to.
+
+    Sets are plain sprite groups ('sprites', 'enemies', 'platforms', ...), so
+    collision code keeps using ``spritecollide`` on them and ``sprite.kill()``
+    still removes a sprite from everything, registry included. ``update()``
+    runs each sprite in the ``update_sets`` once per call, in set order and
+    then insertion order, even when it sits in more than one of them.
+
+    With ``check_updates`` every registered sprite's ``update`` is guarded so a
+    second call within one ``clock`` frame raises AssertionError, from
+    wherever it comes.
+    """
+
+    def __init__(self, update_sets=(), clock=None, check_updates=False):
+        self.owner = pygame.sprite.Group()
+        self.sets = {}
+        self.update_sets = tuple(update_sets)
+        self.clock = clock
+        self.check_updates = check_updates and clock is not None
+        for name in self.update_sets:
+            self.group(name)
+
+    def __len__(self):
+        return len(self.owner)
+
+    def __contains__(self, sprite):
+        return sprite in self.owner
+
+    def group(self, name):
+        """The sprite group for set ``name``; the same object for the registry's whole life."""
+        group = self.sets.get(name)
+        if group is None:
+            group = self.sets[name] = pygame.sprite.Group()
+        return group
+
+    def add(self, sprites, *names):
+        """Register one sprite or any iterable of them and put them in each named set."""
+        if isinstance(sprites, pygame.sprite.Sprite):
+            sprites = [sprites]
+        else:
+            sprites = list(sprites)
+        self.owner.add(sprites)
+        for name in names:
+            self.group(name).add(sprites)
+        if self.check_updates:
+            for sprite in sprites:
+                self.guard(sprite)
+
+    def remove(self, sprites):
+        """Drop sprites from the registry and every set; other groups keep them."""
+        if isinstance(sprites, pygame.sprite.Sprite):
+            sprites = [sprites]
+        else:
+            sprites = list(sprites)
+        self.owner.remove(sprites)
+        for group in self.sets.values():
+            group.remove(sprites)
+
+    def bring_to_front(self, sprite, *names):
+        """Move an owned sprite to the end of each named set, so it updates and draws after the rest."""
+        if sprite not in self.owner:
+            raise KeyError(f"{type(sprite).__name__} is not registered")
+        for name in names:
+            group = self.sets[name]
+            group.remove(sprite)
+            group.add(sprite)
+
+    def clear(self):
+        """Empty every set, keeping the group objects so references to them stay valid."""
+        self.owner.empty()
+        for group in self.sets.values():
+            group.empty()
+
+    def memberships(self, sprite):
+        return [name for name, group in self.sets.items() if sprite in group]
+
+    def update(self):
+        seen = set()
+        for name in self.update_sets:
+            for sprite in self.sets[name].sprites():
+                if sprite not in seen:
+                    seen.add(sprite)
+                    sprite.update()
+
+    def guard(self, sprite):
+        """Assertion mode: make ``sprite.update`` fail if it runs twice in one frame."""
+        if getattr(sprite, "update_guarded", False):
+            return
+        update = sprite.update
+        clock = self.clock
+
+        def checked(*args, **kwargs):
+            frame = clock.frame
+            if sprite.updated_frame == frame:
+                raise AssertionError(f"{type(sprite).__name__} updated twice in frame {frame}")
+            sprite.updated_frame = frame
+            return update(*args, **kwargs)
+
+        sprite.update = checked
+        sprite.updated_frame = None
+        sprite.update_guarded = True
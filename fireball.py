@@ -1,6 +1,10 @@
 import pygame
 import math
 from settings import *
+from atlas import ATLAS
+
+FIREBALL_ROTATION_STEP = 15  # Degrees the fireball spins per frame
+FIREBALL_ROTATION_FRAMES = 360 // FIREBALL_ROTATION_STEP
 
 
 class Fireball(pygame.sprite.Sprite):
@@ -20,14 +24,27 @@ class Fireball(pygame.sprite.Sprite):
         self.animation_frame = 0
 
     def create_sprite(self):
+        """Use the shared fireball sprite from the atlas."""
+        self.image = ATLAS.get("fireball", self.create_sprite_frames).frames[0]
+        # Every spin angle is pre-rotated once and shared by all fireballs
+        self.rotation_frames = ATLAS.get("fireball_rotations", self.create_rotation_frames).frames
+
+    @staticmethod
+    def create_sprite_frames():
         """Create animated fireball sprite."""
-        self.image = pygame.Surface((FIREBALL_SIZE, FIREBALL_SIZE), pygame.SRCALPHA)
+        image = pygame.Surface((FIREBALL_SIZE, FIREBALL_SIZE), pygame.SRCALPHA)
         # Orange/red fireball with yellow center
-        pygame.draw.circle(self.image, (255, 100, 0), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 2)
-        pygame.draw.circle(self.image, (255, 200, 50), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 3)
-        pygame.draw.circle(self.image, (255, 255, 150), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 6)
-        # Store original image for rotation
-        self.original_image = self.image.copy()
+        pygame.draw.circle(image, (255, 100, 0), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 2)
+        pygame.draw.circle(image, (255, 200, 50), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 3)
+        pygame.draw.circle(image, (255, 255, 150), (FIREBALL_SIZE // 2, FIREBALL_SIZE // 2), FIREBALL_SIZE // 6)
+        return [image]
+
+    @staticmethod
+    def create_rotation_frames():
+        """Rotate the base sprite through every spin step (rotating from the original prevents growth)."""
+        base = ATLAS.get("fireball", Fireball.create_sprite_frames).frames[0]
+        return [pygame.transform.rotate(base, step * FIREBALL_ROTATION_STEP)
+                for step in range(FIREBALL_ROTATION_FRAMES)]
 
     def update(self):
         """Update fireball position and check collisions."""
@@ -45,7 +62,7 @@ class Fireball(pygame.sprite.Sprite):
             return
 
         # Check platform collision for bouncing
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platform_index.collide(self)
         if hits and self.vel_y > 0:
             self.rect.bottom = hits[0].rect.top
             self.vel_y = FIREBALL_BOUNCE_POWER
@@ -53,19 +70,18 @@ class Fireball(pygame.sprite.Sprite):
         # Check enemy collision
         enemy_hits = pygame.sprite.spritecollide(self, self.game.enemies, True)
         if enemy_hits:
+            self.game.on_cleared("enemies", len(enemy_hits))
             for enemy in enemy_hits:
                 self.game.player.reward_enemy_defeat()
             self.kill()
             return
 
         # Remove if off screen or fallen too far
-        if self.rect.top > LEVEL_HEIGHT or self.rect.right < 0 or self.rect.left > LEVEL_WIDTH:
+        if self.rect.top > LEVEL_HEIGHT or self.rect.right < 0 or self.rect.left > self.game.level_width:
             self.kill()
 
-        # Animate rotation (rotate from original to prevent growth)
-        self.animation_frame += 15 * self.direction
-        rotated = pygame.transform.rotate(self.original_image, self.animation_frame)
-        old_center = self.rect.center
-        self.image = rotated
-        self.rect = self.image.get_rect()
-        self.rect.center = old_center
+        # Animate rotation using the shared lookup table
+        self.animation_frame += FIREBALL_ROTATION_STEP * self.direction
+        self.image = self.rotation_frames[(self.animation_frame // FIREBALL_ROTATION_STEP) % FIREBALL_ROTATION_FRAMES]
+        if self.image.get_size() != self.rect.size:
+            self.rect = self.image.get_rect(center=self.rect.center)
@@ -0,0 +1,140 @@
+import argparse
+import time
+import pygame
+from settings import FPS, PLAYER_RUN_SPEED, TILE_SIZE
+from controls import InputRecorder
+from bots import CollectBot
+
+# Fixed simulation step: every update_gameplay call advances the world by one 60 Hz frame
+FIXED_TIMESTEP = 1.0 / FPS
+
+
+class ScriptedKeys:
+    """Stand-in for ``pygame.key.get_pressed()`` driven by a script."""
+
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def idle_script(frame, game):
+    return (), ()
+
+
+def run_right_script(frame, game):
+    """Sprint right and hop regularly; enough to traverse most worlds."""
+    pressed = (pygame.K_SPACE,) if frame % 40 == 0 else ()
+    return (pygame.K_RIGHT, pygame.K_LSHIFT), pressed
+
+
+def hop_gaps_script(frame, game):
+    """Sprint right, jumping only at ledges and when an enemy is close ahead."""
+    player = game.player
+    pressed = ()
+    if player.on_ground:
+        rect = player.rect
+        ground_ahead = pygame.Rect(rect.right + PLAYER_RUN_SPEED * 4, rect.bottom, 8, 8)
+        danger_zone = pygame.Rect(rect.right, rect.top - TILE_SIZE, TILE_SIZE * 4, rect.height + TILE_SIZE)
+        if not game.platform_index.any(ground_ahead) or danger_zone.collidelist(
+                [enemy.rect for enemy in game.enemies]) != -1:
+            pressed = (pygame.K_SPACE,)
+    return (pygame.K_RIGHT, pygame.K_LSHIFT), pressed
+
+
+SCRIPTS = {
+    "idle": idle_script,
+    "run-right": run_right_script,
+    "hop-gaps": hop_gaps_script,
+    "collect": CollectBot(),
+}
+
+
+class HeadlessRunner:
+    """Steps a Game as fast as the CPU allows without drawing or vsync.
+
+    A script is a callable ``(frame, game) -> (held_keys, pressed_keys)``;
+    both go through ``game.apply_input`` exactly like input in ``Game.run``, so
+    an attached recorder logs scripted runs too. Auto-upgrade presses RETURN
+    on the level-up screen.
+    """
+
+    def __init__(self, game, script=run_right_script, auto_upgrade=True):
+        self.game = game
+        self.script = script
+        self.auto_upgrade = auto_upgrade
+        self.frames = 0
+
+    def step(self):
+        game = self.game
+        held, pressed = self.script(self.frames, game)
+        if game.state == "level_up" and self.auto_upgrade:
+            pressed = tuple(pressed) + (pygame.K_RETURN,)
+        game.apply_input(ScriptedKeys(held), pressed)
+
+        if game.state == "playing":
+            game.update_gameplay()
+        self.frames += 1
+
+    def run(self, max_frames):
+        game = self.game
+        if game.state == "title":
+            game.start_run()
+        start = time.perf_counter()
+        while self.frames < max_frames and game.running and game.state != "game_over":
+            self.step()
+        elapsed = time.perf_counter() - start
+        simulated = self.frames * FIXED_TIMESTEP
+        return {
+            "frames": self.frames,
+            "wall_seconds": elapsed,
+            "simulated_seconds": simulated,
+            "sim_fps": self.frames / elapsed if elapsed > 0 else float("inf"),
+            "speedup": simulated / elapsed if elapsed > 0 else float("inf"),
+            "state": game.state,
+            "world": game.level_number,
+            "score": game.player.score if game.player else 0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run UltraLorenzo without a display for batch playthroughs.")
+    parser.add_argument("--frames", type=int, default=FPS * 60, help="Frames to simulate")
+    parser.add_argument("--world", type=int, default=1, help="World to start on")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="run-right", help="Scripted input to play with")
+    parser.add_argument("--seed", type=int, help="Run seed for reproducible worlds")
+    parser.add_argument("--world-cache", metavar="DIR", help="Reuse generated worlds cached in this directory")
+    parser.add_argument("--record", metavar="PATH", help="Log the run's input for replay with controls.py")
+    parser.add_argument("--endless", action="store_true", help="Play the endless streamed world instead of fixed worlds")
+    parser.add_argument("--check-updates", action="store_true", help="Assert that no sprite updates twice in a frame")
+    args = parser.parse_args()
+    if args.endless and args.world > 1:
+        parser.error("--world does not apply to --endless")
+
+    from main import Game
+    game = Game(headless=True, seed=args.seed, world_cache=args.world_cache, endless=args.endless,
+                check_updates=args.check_updates)
+    game.start_run()
+    if args.world > 1:
+        game.level_number = args.world
+        game.generate_new_level()
+
+    if args.record:
+        try:
+            game.recorder = InputRecorder(args.record, game)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    stats = HeadlessRunner(game, SCRIPTS[args.script]).run(args.frames)
+    if game.recorder:
+        game.recorder.close(game)
+    print(f"Simulated {stats['frames']} frames ({stats['simulated_seconds']:.1f}s game time) "
+          f"in {stats['wall_seconds']:.2f}s")
+    print(f"Simulated FPS: {stats['sim_fps']:.0f} ({stats['speedup']:.1f}x real time)")
+    print(f"Ended in state '{stats['state']}' on world {stats['world']} with score {stats['score']} (seed {game.rng.seed})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
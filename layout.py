@@ -0,0 +1,353 @@
+import argparse
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from settings import *
+from rng import RunRandom
+
+# Pure-data level layouts. Nothing in this module touches pygame, so layouts
+# can be generated, validated and pickled across processes freely.
+
+THEMES = [
+    {
+        "name": "Emerald Meadows",
+        "sky": (135, 206, 235),
+        "ground": (95, 180, 110),
+        "platform_top": (86, 190, 120),
+        "platform_side": (70, 140, 95),
+        "mountain": (90, 110, 150),
+        "snow_cap": (245, 245, 245),
+        "hill": (60, 160, 90),
+        "cloud": (255, 255, 255)
+    },
+    {
+        "name": "Amber Dunes",
+        "sky": (245, 205, 160),
+        "ground": (205, 150, 80),
+        "platform_top": (215, 180, 120),
+        "platform_side": (175, 120, 70),
+        "mountain": (160, 120, 90),
+        "snow_cap": (230, 200, 160),
+        "hill": (210, 160, 100),
+        "cloud": (255, 240, 220)
+    },
+    {
+        "name": "Violet Peaks",
+        "sky": (90, 120, 200),
+        "ground": (120, 110, 190),
+        "platform_top": (140, 120, 210),
+        "platform_side": (90, 70, 150),
+        "mountain": (70, 60, 130),
+        "snow_cap": (200, 210, 255),
+        "hill": (130, 100, 200),
+        "cloud": (220, 210, 255)
+    }
+]
+
+GENERATOR_VERSION = 2  # Bump whenever generate_layout output changes for the same inputs
+ENEMY_KINDS = ("walker", "hopper", "flyer")  # EnemyRecord.kind indexes this tuple
+COIN_SPACING = 45  # Fixed spacing between coins in a cluster
+
+MountainRecord = namedtuple("MountainRecord", ["x", "y", "w", "h"])
+HillRecord = namedtuple("HillRecord", ["x", "base_y", "w", "h"])
+CloudRecord = namedtuple("CloudRecord", ["x", "y", "w", "h", "speed"])
+CoinRecord = namedtuple("CoinRecord", ["x", "y"])
+BoxRecord = namedtuple("BoxRecord", ["x", "y"])
+EnemyRecord = namedtuple("EnemyRecord", ["kind", "x", "y"])
+MarkerRecord = namedtuple("MarkerRecord", ["x", "y", "h"])
+
+# Endless mode lays the world out one chunk at a time. The ground and platform
+# chains overshoot a chunk's right edge, so each chunk hands the next one the x
+# where each chain stopped and the height of the last platform.
+CHUNK_WIDTH = WINDOW_WIDTH
+ChunkState = namedtuple("ChunkState", ["ground_x", "platform_x", "last_y"])
+ENDLESS_START = ChunkState(0, 120, LEVEL_HEIGHT - PLATFORM_HEIGHT)
+
+
+class PlatformRecord(namedtuple("PlatformRecord", ["x", "y", "w", "h", "travel", "speed", "direction"])):
+    """Platform placement; ``travel`` is 0 for platforms that never move."""
+    __slots__ = ()
+
+    @property
+    def moving(self):
+        return self.travel > 0
+
+    @property
+    def min_x(self):
+        return self.x - self.travel if self.moving else self.x
+
+    @property
+    def max_right(self):
+        return self.x + self.w + self.travel if self.moving else self.x + self.w
+
+
+class LevelLayout(namedtuple("LevelLayout", ["theme_index", "enemy_speed_scale", "mountains", "hills",
+                                             "clouds", "platforms", "coins", "boxes", "enemies",
+                                             "final_box", "end_marker"])):
+    """Every layout decision for one world, as compact records."""
+    __slots__ = ()
+
+    @property
+    def theme(self):
+        return THEMES[self.theme_index]
+
+
+def difficulty_profile(level_number):
+    level_index = max(1, level_number)
+    gap_scale = min(1.0 + 0.05 * (level_index - 1), 1.7)
+    enemy_density = min(0.25 + 0.05 * (level_index - 1), 0.8)
+    moving_platform_chance = min(0.08 + 0.02 * (level_index - 1), 0.45)
+    enemy_speed_scale = min(1.0 + 0.05 * (level_index - 1), 1.8)
+    coin_cluster_size = int(min(4 + level_index, 8))  # level_number may be fractional in endless mode
+    mid_powerup_chance = max(0.4 - 0.03 * (level_index - 1), 0.15)
+    return {
+        "gap_scale": gap_scale,
+        "enemy_density": enemy_density,
+        "moving_platform_chance": moving_platform_chance,
+        "enemy_speed_scale": enemy_speed_scale,
+        "coin_cluster_size": coin_cluster_size,
+        "mid_powerup_chance": mid_powerup_chance
+    }
+
+
+def distance_difficulty(x):
+    """Endless-mode difficulty at world x: the same knobs, ramping one world per LEVEL_WIDTH travelled."""
+    return difficulty_profile(1 + x / LEVEL_WIDTH)
+
+
+def is_gap_jumpable(gap_width, platform_height_diff):
+    # Use run speed for gap calculations since player can run and jump
+    return (gap_width <= PLAYER_RUN_SPEED * 6 and
+            abs(platform_height_diff) <= MAX_JUMP_HEIGHT)
+
+
+def enemy_kinds_for(difficulty_profile):
+    """Enemy kinds (indices into ENEMY_KINDS) unlocked at this enemy density."""
+    kinds = [0]
+    if difficulty_profile["enemy_density"] > 0.35:
+        kinds.append(1)
+    if difficulty_profile["enemy_density"] > 0.45:
+        kinds.append(2)
+    return kinds
+
+
+def place_ground(rng, difficulty_profile, current_x, end_x, platforms):
+    """Lay ground segments (with gaps past the first screen) from ``current_x`` until ``end_x``.
+
+    Returns the x where the next segment would start.
+    """
+    while current_x < end_x:
+        if current_x > WINDOW_WIDTH and rng.random() < 0.3:
+            gap_width = rng.randint(MIN_GAP_WIDTH,
+                                    int(MAX_GAP_WIDTH * difficulty_profile["gap_scale"]))
+            current_x += gap_width
+        else:
+            width = rng.randint(MIN_PLATFORM_WIDTH * 2, MAX_PLATFORM_WIDTH * 2)
+            platforms.append(PlatformRecord(current_x, LEVEL_HEIGHT - PLATFORM_HEIGHT, width,
+                                            PLATFORM_HEIGHT, 0, 0.0, 0))
+            current_x += width
+    return current_x
+
+
+def place_platforms(rng, difficulty_profile, current_x, end_x, last_platform_y,
+                    platforms, coins, boxes, enemies):
+    """Lay floating platforms with their coins, boxes and enemies from ``current_x`` until ``end_x``.
+
+    Returns ``(next_x, last_platform_y)`` so a later call can carry on the chain.
+    """
+    enemy_kinds = enemy_kinds_for(difficulty_profile)
+    while current_x < end_x:
+        width = rng.randint(MIN_PLATFORM_WIDTH, MAX_PLATFORM_WIDTH)
+        min_y = max(last_platform_y - MAX_JUMP_HEIGHT, LEVEL_HEIGHT - 320)
+        max_y = min(last_platform_y + MAX_JUMP_HEIGHT, LEVEL_HEIGHT - 120)
+        if min_y >= max_y:
+            min_y = max_y - MAX_JUMP_HEIGHT
+        y = rng.randint(int(min_y), int(max_y))
+
+        if rng.random() < difficulty_profile["moving_platform_chance"]:
+            travel = rng.randint(40, 120)
+            speed = rng.uniform(1.0, 1.8) * difficulty_profile["enemy_speed_scale"]
+            platforms.append(PlatformRecord(current_x, y, width, PLATFORM_HEIGHT,
+                                            travel, speed, rng.choice([-1, 1])))
+        else:
+            platforms.append(PlatformRecord(current_x, y, width, PLATFORM_HEIGHT, 0, 0.0, 0))
+
+        max_coins = max(1, (width - 20) // COIN_SPACING)  # Calculate how many coins fit
+        coin_count = min(rng.randint(1, difficulty_profile["coin_cluster_size"]), max_coins)
+
+        # Center the coins on the platform
+        total_coin_width = (coin_count - 1) * COIN_SPACING if coin_count > 1 else 0
+        start_offset = (width - total_coin_width) // 2
+
+        for i in range(coin_count):
+            offset = start_offset + (i * COIN_SPACING)
+            coins.append(CoinRecord(current_x + offset - COIN_SIZE // 2, y - 50))
+
+        if rng.random() < difficulty_profile["mid_powerup_chance"]:
+            boxes.append(BoxRecord(current_x + width // 2 - POWERUP_SIZE // 2, y - POWERUP_SIZE - 10))
+
+        if rng.random() < difficulty_profile["enemy_density"]:
+            kind = rng.choice(enemy_kinds)
+            spawn_y = y - ENEMY_HEIGHT
+            if ENEMY_KINDS[kind] == "flyer":
+                spawn_y = y - ENEMY_HEIGHT - rng.randint(60, 140)
+            enemies.append(EnemyRecord(kind, current_x + width // 2, spawn_y))
+
+        gap = rng.randint(MIN_GAP_WIDTH,
+                          int(MAX_GAP_WIDTH * difficulty_profile["gap_scale"]))
+        attempts = 0
+        while not is_gap_jumpable(gap, y - last_platform_y) and attempts < 5:
+            gap = rng.randint(MIN_GAP_WIDTH, MAX_GAP_WIDTH)
+            y = rng.randint(int(min_y), int(max_y))
+            attempts += 1
+        if attempts >= 5:
+            gap = MIN_GAP_WIDTH
+
+        current_x += width + gap
+        last_platform_y = y
+    return current_x, last_platform_y
+
+
+def generate_layout(difficulty_profile, rng):
+    """Make every random layout decision for a world using ``rng``."""
+    theme_index = rng.randrange(len(THEMES))
+    mountains = []
+    hills = []
+    clouds = []
+    platforms = []
+    coins = []
+    boxes = []
+    enemies = []
+
+    for i in range(3):
+        x = i * (LEVEL_WIDTH // 3)
+        width = rng.randint(500, 800)
+        height = rng.randint(280, 420)
+        mountains.append(MountainRecord(x, LEVEL_HEIGHT - height, width, height))
+
+    hill_width = 600
+    hill_overlap = 180
+    for i in range((LEVEL_WIDTH + hill_overlap) // (hill_width - hill_overlap)):
+        x = i * (hill_width - hill_overlap) - hill_overlap // 2
+        height = rng.randint(180, 320)
+        hills.append(HillRecord(x, LEVEL_HEIGHT, hill_width, height))
+
+    for i in range(12):
+        x = rng.randint(0, LEVEL_WIDTH)
+        y = rng.randint(50, LEVEL_HEIGHT // 2)
+        width = rng.randint(70, 130)
+        height = rng.randint(30, 60)
+        clouds.append(CloudRecord(x, y, width, height, rng.uniform(0.2, 0.5)))
+
+    place_ground(rng, difficulty_profile, 0, LEVEL_WIDTH - 400, platforms)
+
+    # End level generation before final area to ensure final box is last collectible
+    level_end_x = LEVEL_WIDTH - 450
+    place_platforms(rng, difficulty_profile, 120, level_end_x, LEVEL_HEIGHT - PLATFORM_HEIGHT,
+                    platforms, coins, boxes, enemies)
+
+    end_x = LEVEL_WIDTH - 400
+    platforms.append(PlatformRecord(end_x + 50, LEVEL_HEIGHT - 150, 150, PLATFORM_HEIGHT, 0, 0.0, 0))
+    platforms.append(PlatformRecord(end_x + 250, LEVEL_HEIGHT - 220, 120, PLATFORM_HEIGHT, 0, 0.0, 0))
+    for i in range(6):
+        coins.append(CoinRecord(end_x + 150 + i * 35, LEVEL_HEIGHT - 260))
+
+    return LevelLayout(theme_index, difficulty_profile["enemy_speed_scale"], mountains, hills, clouds,
+                       platforms, coins, boxes, enemies,
+                       BoxRecord(end_x + 280, LEVEL_HEIGHT - 270), MarkerRecord(end_x, 0, LEVEL_HEIGHT))
+
+
+def generate_chunk(index, state, theme_index, rng):
+    """Lay out endless-mode chunk ``index`` carrying on from ``state``.
+
+    Returns ``(layout, next_state)``. Chunk layouts have no backdrop, final box
+    or end marker; records may reach past the chunk's right edge.
+    """
+    start_x = index * CHUNK_WIDTH
+    end_x = start_x + CHUNK_WIDTH
+    profile = distance_difficulty(start_x)
+    platforms = []
+    coins = []
+    boxes = []
+    enemies = []
+    ground_x = place_ground(rng, profile, state.ground_x, end_x, platforms)
+    platform_x, last_y = place_platforms(rng, profile, state.platform_x, end_x, state.last_y,
+                                         platforms, coins, boxes, enemies)
+    layout = LevelLayout(theme_index, profile["enemy_speed_scale"], [], [], [], platforms, coins, boxes, enemies,
+                         None, None)
+    return layout, ChunkState(ground_x, platform_x, last_y)
+
+
+def _within_reach(platform, x, y, width):
+    """Rough check that something at (x, y) can be touched from ``platform``."""
+    horizontal = platform.min_x - MAX_GAP_WIDTH <= x + width and x <= platform.max_right + MAX_GAP_WIDTH
+    return horizontal and 0 < platform.y - y <= MAX_JUMP_HEIGHT + PLAYER_HEIGHT
+
+
+def validate_layout(layout):
+    """Cheap structural checks; returns a list of problems (empty when the layout is sound)."""
+    problems = []
+    if not layout.platforms:
+        return ["no platforms"]
+
+    for index, platform in enumerate(layout.platforms):
+        if platform.w <= 0 or platform.h <= 0:
+            problems.append(f"platform {index} has no area")
+        if platform.min_x < 0 or platform.max_right > LEVEL_WIDTH + MAX_PLATFORM_WIDTH * 2:
+            problems.append(f"platform {index} leaves the level horizontally")
+        if not 0 <= platform.y < LEVEL_HEIGHT:
+            problems.append(f"platform {index} leaves the level vertically")
+
+    for index, coin in enumerate(layout.coins):
+        if not any(_within_reach(platform, coin.x, coin.y, COIN_SIZE) for platform in layout.platforms):
+            problems.append(f"coin {index} has no platform within reach")
+
+    for index, box in enumerate(layout.boxes + [layout.final_box]):
+        if not any(_within_reach(platform, box.x, box.y, POWERUP_SIZE) for platform in layout.platforms):
+            problems.append(f"box {index} has no platform within reach")
+
+    for index, enemy in enumerate(layout.enemies):
+        if not 0 <= enemy.kind < len(ENEMY_KINDS):
+            problems.append(f"enemy {index} has unknown kind {enemy.kind}")
+        if not 0 <= enemy.x < LEVEL_WIDTH:
+            problems.append(f"enemy {index} spawns outside the level")
+
+    if not layout.end_marker.x < layout.final_box.x < LEVEL_WIDTH:
+        problems.append("final box is not inside the end area")
+    return problems
+
+
+def layout_job(job):
+    """Process-pool worker: ``(seed, world)`` -> ``(seed, world, layout, problems)``."""
+    seed, world = job
+    rng = RunRandom(seed).stream("level", world)
+    layout = generate_layout(difficulty_profile(world), rng)
+    return seed, world, layout, validate_layout(layout)
+
+
+def generate_layouts(jobs, processes=None, chunksize=16):
+    """Generate and validate many ``(seed, world)`` layouts across a process pool."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(layout_job, jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and validate level layouts without pygame.")
+    parser.add_argument("--seeds", type=int, default=100, help="Number of run seeds (0..N-1)")
+    parser.add_argument("--worlds", type=int, default=30, help="Worlds 1..N per seed")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    jobs = [(seed, world) for seed in range(args.seeds) for world in range(1, args.worlds + 1)]
+    start = time.perf_counter()
+    results = generate_layouts(jobs, args.processes)
+    elapsed = time.perf_counter() - start
+    invalid = [(seed, world, problems) for seed, world, _, problems in results if problems]
+    print(f"Generated {len(results)} layouts in {elapsed:.2f}s ({len(results) / elapsed:.0f} worlds/s)")
+    print(f"Invalid layouts: {len(invalid)}")
+    for seed, world, problems in invalid[:10]:
+        print(f"  seed {seed} world {world}: {'; '.join(problems)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import mmap
+import os
+import struct
+import threading
+from layout import (LevelLayout, MountainRecord, HillRecord, CloudRecord, PlatformRecord, CoinRecord,
+                    BoxRecord, EnemyRecord, MarkerRecord, difficulty_profile)
+from reachability import generate_solvable_layout
+from rng import RunRandom
+
+try:
+    import numpy as np
+except ImportError:  # numpy views are optional; the mmap tables work without it
+    np = None
+
+# Binary level format: a fixed header followed by fixed-width little-endian
+# record tables in TABLES order. Every table is a flat struct array, so tools
+# can index a file straight out of the memory map. Loading a world for play
+# still unpacks every record into a layout; what a file saves is generation
+# and the reachability search, not per-entity parsing.
+
+LEVEL_MAGIC = b"ULVL"
+LEVEL_FORMAT_VERSION = 2  # 2: seed widened to a signed 64-bit field, like the replay header
+LEVEL_FILE_SUFFIX = ".ulvl"
+TEMP_SUFFIX = ".tmp"  # write_level writes to <path>.tmp<pid>-<thread> and renames into place
+
+# magic, version, theme, seed, world, enemy_speed_scale, final box x/y, end marker x/y/h, table counts
+HEADER = struct.Struct("<4sHHqId2i3i7I")
+
+TABLES = (
+    ("mountains", struct.Struct("<4i"), MountainRecord),
+    ("hills", struct.Struct("<4i"), HillRecord),
+    ("clouds", struct.Struct("<4id"), CloudRecord),
+    ("platforms", struct.Struct("<5idi"), PlatformRecord),
+    ("coins", struct.Struct("<2i"), CoinRecord),
+    ("boxes", struct.Struct("<2i"), BoxRecord),
+    ("enemies", struct.Struct("<3i"), EnemyRecord),
+)
+
+TABLE_STRUCTS = {name: record_struct for name, record_struct, _ in TABLES}
+TABLE_TYPES = {name: record_type for name, _, record_type in TABLES}
+
+NUMPY_DTYPES = {
+    "mountains": [("x", "<i4"), ("y", "<i4"), ("w", "<i4"), ("h", "<i4")],
+    "hills": [("x", "<i4"), ("base_y", "<i4"), ("w", "<i4"), ("h", "<i4")],
+    "clouds": [("x", "<i4"), ("y", "<i4"), ("w", "<i4"), ("h", "<i4"), ("speed", "<f8")],
+    "platforms": [("x", "<i4"), ("y", "<i4"), ("w", "<i4"), ("h", "<i4"), ("travel", "<i4"),
+                  ("speed", "<f8"), ("direction", "<i4")],
+    "coins": [("x", "<i4"), ("y", "<i4")],
+    "boxes": [("x", "<i4"), ("y", "<i4")],
+    "enemies": [("kind", "<i4"), ("x", "<i4"), ("y", "<i4")],
+}
+
+
+class LevelFormatError(ValueError):
+    pass
+
+
+def encode_level(layout, seed=0, world=0):
+    """Serialize a LevelLayout to bytes."""
+    tables = [getattr(layout, name) for name, _, _ in TABLES]
+    parts = [HEADER.pack(LEVEL_MAGIC, LEVEL_FORMAT_VERSION, layout.theme_index, seed, world,
+                         layout.enemy_speed_scale, layout.final_box.x, layout.final_box.y,
+                         layout.end_marker.x, layout.end_marker.y, layout.end_marker.h,
+                         *(len(records) for records in tables))]
+    for (_, record_struct, _), records in zip(TABLES, tables):
+        parts.extend(record_struct.pack(*record) for record in records)
+    return b"".join(parts)
+
+
+def write_level(path, layout, seed=0, world=0):
+    """Write atomically so readers never map a half-written file."""
+    temp_path = f"{path}{TEMP_SUFFIX}{os.getpid()}-{threading.get_ident()}"
+    try:
+        with open(temp_path, "wb") as handle:
+            handle.write(encode_level(layout, seed, world))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class LevelFile:
+    """Memory-mapped view over a level file.
+
+    ``table(name)`` is a zero-copy memoryview of the packed records and
+    ``array(name)`` a numpy structured array over the same bytes, for tools
+    that inspect files without building a layout. ``records``/``to_layout``
+    unpack them into layout records, one Python object per entity.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.handle.close()
+            raise LevelFormatError(f"{path}: empty level file")
+        self.buffer = memoryview(self.map)
+        try:
+            self.read_header()
+        except LevelFormatError:
+            # Unmap before the caller sees the error so it can delete the bad file (Windows refuses while mapped)
+            self.close()
+            raise
+
+    def read_header(self):
+        if len(self.buffer) < HEADER.size:
+            raise LevelFormatError(f"{self.path}: truncated header")
+        fields = HEADER.unpack_from(self.buffer, 0)
+        magic, version = fields[0], fields[1]
+        if magic != LEVEL_MAGIC:
+            raise LevelFormatError(f"{self.path}: not a level file")
+        if version != LEVEL_FORMAT_VERSION:
+            raise LevelFormatError(f"{self.path}: unsupported format version {version}")
+        (self.theme_index, self.seed, self.world, self.enemy_speed_scale,
+         box_x, box_y, marker_x, marker_y, marker_h) = fields[2:11]
+        self.final_box = BoxRecord(box_x, box_y)
+        self.end_marker = MarkerRecord(marker_x, marker_y, marker_h)
+
+        self.counts = {}
+        self.offsets = {}
+        offset = HEADER.size
+        for (name, record_struct, _), count in zip(TABLES, fields[11:]):
+            self.counts[name] = count
+            self.offsets[name] = offset
+            offset += record_struct.size * count
+        if offset > len(self.buffer):
+            raise LevelFormatError(f"{self.path}: truncated record tables")
+
+    def table(self, name):
+        start = self.offsets[name]
+        return self.buffer[start:start + TABLE_STRUCTS[name].size * self.counts[name]]
+
+    def array(self, name):
+        """Structured numpy view of a table; drop it before closing the file."""
+        if np is None:
+            raise RuntimeError("numpy is required for LevelFile.array")
+        return np.frombuffer(self.map, dtype=np.dtype(NUMPY_DTYPES[name]),
+                             count=self.counts[name], offset=self.offsets[name])
+
+    def records(self, name):
+        record_type = TABLE_TYPES[name]
+        return [record_type(*values) for values in TABLE_STRUCTS[name].iter_unpack(self.table(name))]
+
+    def to_layout(self):
+        tables = {name: self.records(name) for name, _, _ in TABLES}
+        return LevelLayout(self.theme_index, self.enemy_speed_scale, tables["mountains"], tables["hills"],
+                           tables["clouds"], tables["platforms"], tables["coins"], tables["boxes"],
+                           tables["enemies"], self.final_box, self.end_marker)
+
+    def close(self):
+        if self.map is None:
+            return
+        self.buffer.release()
+        self.map.close()
+        self.handle.close()
+        self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_level(path):
+    """Load a level file as a LevelLayout, parsing every record (the game's load path)."""
+    with LevelFile(path) as level_file:
+        return level_file.to_layout()
+
+
+class LevelPack:
+    """Directory of curated level files named ``world_NNN.ulvl``."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, world):
+        return os.path.join(self.directory, f"world_{world:03d}{LEVEL_FILE_SUFFIX}")
+
+    def load(self, world):
+        """Return the pack's layout for ``world``, or None when the pack has no such world."""
+        path = self.path_for(world)
+        if not os.path.exists(path):
+            return None
+        return read_level(path)
+
+    def save(self, world, layout, seed=0):
+        os.makedirs(self.directory, exist_ok=True)
+        write_level(self.path_for(world), layout, seed, world)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect binary level files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Generate seeded worlds into a level pack directory")
+    export.add_argument("directory")
+    export.add_argument("--seed", type=int, default=0)
+    export.add_argument("--worlds", type=int, default=10, help="Export worlds 1..N")
+    info = commands.add_parser("info", help="Print the header and table sizes of level files")
+    info.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        pack = LevelPack(args.directory)
+        run_random = RunRandom(args.seed)
+        for world in range(1, args.worlds + 1):
+            layout = generate_solvable_layout(difficulty_profile(world), run_random.stream("level", world))
+            pack.save(world, layout, args.seed)
+        print(f"Wrote {args.worlds} worlds to {args.directory}")
+    else:
+        for path in args.paths:
+            with LevelFile(path) as level_file:
+                tables = ", ".join(f"{name}={count}" for name, count in level_file.counts.items())
+                print(f"{path}: seed {level_file.seed} world {level_file.world} "
+                      f"theme {level_file.theme_index} ({os.path.getsize(path)} bytes) {tables}")
+
+
+if __name__ == "__main__":
+    main()
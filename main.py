@@ -1,21 +1,72 @@
+import argparse
+import math
+import os
 import pygame
 import sys
 import random
 from datetime import datetime
 from settings import *
 from player import Player
-from level import LevelGenerator
+from level import LevelGenerator, MovingPlatform
+from powerups import FinalBox
 from camera import Camera
+from spatial import SpatialHash
+from simclock import SimClock
+from static_layer import StaticLayer
+from text_cache import FontRegistry, TextCache
+from profiler import FrameProfiler
+from rng import RunRandom
+from prefetch import LevelPrefetcher
+from layout import difficulty_profile
+from levelfile import LevelPack
+from world_cache import WorldCache
+import enemy_system
+from enemy_system import EnemySystem
+from coin_field import CoinField
+from controls import InputRecorder
+from endless import EndlessWorld
+from entities import EntityRegistry
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, level_pack=None, world_cache=None, vector_enemies=False,
+                 dirty_rects=False, endless=False, check_updates=False):
+        self.headless = headless
+        self.endless = endless  # One world streamed in chunks instead of fixed-width worlds
+        self.endless_world = None
+        self.level_width = math.inf if endless else LEVEL_WIDTH  # Where enemies and fireballs meet the level edge
+        self.world_left = 0  # Left edge of the playable world; endless mode raises it as chunks retire
+        self.dirty_rect_mode = dirty_rects  # Menus push only changed regions instead of flipping
+        self.presented_view = None
+        self.previous_dirty = []
+        self.menu_redraws = 0  # Bumped whenever a menu's static content changes, e.g. new upgrade choices
+        # Batched NumPy enemies when possible; their platform arrays are per world, so not in endless mode.
+        # Only worlds with BATCH_MIN_ENEMIES or more use them, which generated worlds never reach, so no
+        # CLI turns this on; benchmark.py compares the two paths on synthetic crowds instead.
+        self.vector_enemies = vector_enemies and enemy_system.available() and not endless
+        self.enemy_system = None
+        self.level_pack = LevelPack(level_pack) if level_pack else None  # Curated worlds override generation
+        self.world_cache = WorldCache(world_cache) if world_cache else None
+        if headless:
+            # The dummy driver gives us a real display surface without a window; it overrides any exported
+            # driver, which could otherwise open a window or fail on a machine without a display
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
-        # Create fullscreen display with scaled rendering
-        # This scales the game to fullscreen while keeping aspect ratio
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN | pygame.SCALED)
+        if headless:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        else:
+            # Create fullscreen display with scaled rendering
+            # This scales the game to fullscreen while keeping aspect ratio
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN | pygame.SCALED)
         pygame.display.set_caption("UltraLorenzo")
         self.clock = pygame.time.Clock()
+        self.sim_clock = SimClock()  # Drives all gameplay timers, independent of wall time
+        self.key_state = pygame.key.get_pressed()  # Held keys read by the player each frame
+        self.recorder = None  # controls.InputRecorder when the run's input is being logged
+        self.fonts = FontRegistry()
+        self.text = TextCache(self.fonts)
+        self.profiler = FrameProfiler()  # F3 toggles the overlay
 
         self.running = True
         self.state = "title"
@@ -24,19 +75,32 @@ class Game:
         self.username = "Jmk125"
 
         self.camera = None
+        self.final_box = None
         self.player = None
+        self.seed = seed  # Pinned with --seed; otherwise every run draws a fresh one
+        self.rng = RunRandom(seed)  # Every gameplay RNG stream derives from the current run's seed
+        self.upgrade_rng = self.rng.stream("upgrades")
         self.level_generator = LevelGenerator(self)
-        self.all_sprites = pygame.sprite.Group()
-        self.background = pygame.sprite.Group()
-        self.midground = pygame.sprite.Group()
-        self.foreground = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
-        self.coins = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
-        self.powerup_boxes = pygame.sprite.Group()
+        self.prefetcher = LevelPrefetcher(self.plan_world)
+        # Every world sprite is owned by the registry; the attributes below are its sets and never get rebound.
+        # 'sprites' (moving platforms, boxes, coins, enemies, player, fireballs) update then draw in world
+        # space; midground clouds drift, so that set updates too. check_updates asserts one update per frame.
+        self.entities = EntityRegistry(("sprites", "midground"), self.sim_clock, check_updates)
+        self.all_sprites = self.entities.group("sprites")
+        self.background = self.entities.group("background")
+        self.midground = self.entities.group("midground")
+        self.foreground = self.entities.group("foreground")
+        self.platforms = self.entities.group("platforms")
+        self.enemies = self.entities.group("enemies")
+        self.powerup_boxes = self.entities.group("powerup_boxes")
+        self.platform_index = SpatialHash()
+        self.terrain_layer = StaticLayer([])
+        self.overlay_layer = StaticLayer([])
+        self.coins = self.entities.group("coins")  # Or a CoinField, which is not a sprite set
         self.notifications = []
         self.current_theme = {"name": "Sky Realm", "sky": SKY_BLUE}
         self.title_particles = self.create_title_particles()
+        self.backdrops = {}  # Static menu layers, built on first use and reused every frame
         self.selected_upgrade_index = 0  # For navigating level-up menu
 
     def create_title_particles(self):
@@ -53,72 +117,115 @@ class Game:
     def start_run(self):
         self.level_number = 1
         self.start_time = datetime.utcnow()
+        self.sim_clock.reset()
+        self.prefetcher.cancel()  # Its planner reads self.rng, which is about to change
+        self.rng = RunRandom(self.seed)
+        self.upgrade_rng = self.rng.stream("upgrades")
+        if self.recorder:
+            self.recorder.start_run(self)
         self.notifications.clear()
         self.setup_new_game()
         self.state = "playing"
 
     def setup_new_game(self):
-        self.camera = Camera(LEVEL_WIDTH, LEVEL_HEIGHT)
-        self.all_sprites = pygame.sprite.Group()
-        self.background = pygame.sprite.Group()
-        self.midground = pygame.sprite.Group()
-        self.foreground = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
-        self.coins = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
-        self.powerup_boxes = pygame.sprite.Group()
+        self.camera = Camera(None if self.endless else LEVEL_WIDTH, LEVEL_HEIGHT)
+        self.entities.clear()
+        self.platform_index = SpatialHash()
+        self.coins = self.entities.group("coins")
 
         self.player = Player(self)
-        self.all_sprites.add(self.player)
+        self.entities.add(self.player, "sprites")
         self.generate_new_level()
 
-    def get_difficulty_profile(self):
-        level_index = max(1, self.level_number)
-        gap_scale = min(1.0 + 0.05 * (level_index - 1), 1.7)
-        enemy_density = min(0.25 + 0.05 * (level_index - 1), 0.8)
-        moving_platform_chance = min(0.08 + 0.02 * (level_index - 1), 0.45)
-        enemy_speed_scale = min(1.0 + 0.05 * (level_index - 1), 1.8)
-        coin_cluster_size = min(4 + level_index, 8)
-        mid_powerup_chance = max(0.4 - 0.03 * (level_index - 1), 0.15)
-        return {
-            "gap_scale": gap_scale,
-            "enemy_density": enemy_density,
-            "moving_platform_chance": moving_platform_chance,
-            "enemy_speed_scale": enemy_speed_scale,
-            "coin_cluster_size": coin_cluster_size,
-            "mid_powerup_chance": mid_powerup_chance
-        }
+    def get_difficulty_profile(self, level_number=None):
+        return difficulty_profile(self.level_number if level_number is None else level_number)
+
+    def world_rngs(self, world):
+        """Layout and behavior RNG streams for a world; identical for a given seed."""
+        return self.rng.stream("level", world), self.rng.stream("ai", world)
+
+    def plan_world(self, world):
+        """Layout for ``world``: from the on-disk cache when possible, otherwise generated.
+
+        Runs on the prefetch thread, so it must not touch pygame or game state.
+        """
+        difficulty = self.get_difficulty_profile(world)
+        if self.world_cache:
+            layout = self.world_cache.get(self.rng.seed, world, difficulty)
+            if layout is not None:
+                return layout
+        layout = self.level_generator.plan_level(difficulty, self.world_rngs(world)[0])
+        if self.world_cache:
+            self.world_cache.put(self.rng.seed, world, difficulty, layout)
+        return layout
 
     def generate_new_level(self):
         if not self.player:
             return
-        difficulty = self.get_difficulty_profile()
-        background, midground, platforms, coins, enemies, powerups, foreground, theme = self.level_generator.generate_level(difficulty)
-
-        # Keep separate layer groups for parallax rendering
-        self.background = background
-        self.midground = midground
-        self.foreground = foreground
-        self.platforms = platforms
-        self.coins = coins
-        self.enemies = enemies
-        self.powerup_boxes = powerups
+        if self.endless:
+            if self.endless_world:
+                self.endless_world.close()
+            self.endless_world = EndlessWorld(self)
+            self.endless_world.start()
+            self.player.spawn()
+            return
+        ai_rng = self.world_rngs(self.level_number)[1]
+        plan = self.level_pack.load(self.level_number) if self.level_pack else None
+        if plan is None:
+            plan = self.prefetcher.take(self.level_number)
+        if plan is None:
+            plan = self.plan_world(self.level_number)
+        (background, midground, platforms, coins, enemies, powerups, foreground, theme,
+         platform_index, terrain_layer, overlay_layer) = self.level_generator.build_level(plan, ai_rng)
+
+        self.platform_index = platform_index
+        self.terrain_layer = terrain_layer
+        self.overlay_layer = overlay_layer
         self.current_theme = theme
-
-        # Gameplay sprites (non-background) for updating
-        self.all_sprites = pygame.sprite.Group()
-        for sprite in self.platforms:
-            self.all_sprites.add(sprite)
-        for sprite in self.powerup_boxes:
-            self.all_sprites.add(sprite)
-        for sprite in self.coins:
-            self.all_sprites.add(sprite)
-        for sprite in self.enemies:
-            self.all_sprites.add(sprite)
-        self.all_sprites.add(self.player)
+        self.final_box = next(box for box in powerups if isinstance(box, FinalBox))
+        self.final_box.track(len(enemies), len(coins),
+                             sum(1 for box in powerups if box is not self.final_box and box.has_powerup))
+
+        # Layer sets for parallax rendering; static platforms are drawn from terrain_layer, and
+        # the 'sprites' set keeps the old update and draw order with the player last
+        entities = self.entities
+        entities.clear()
+        entities.add(background, "background")
+        entities.add(midground, "midground")
+        entities.add(foreground, "foreground")
+        entities.add(platforms, "platforms")
+        entities.add([sprite for sprite in platforms if isinstance(sprite, MovingPlatform)], "sprites")
+        entities.add(powerups, "powerup_boxes", "sprites")
+        if isinstance(coins, CoinField):
+            self.coins = coins
+        else:
+            self.coins = entities.group("coins")
+            entities.add(coins, "coins", "sprites")
+        self.enemy_system = None
+        if self.vector_enemies and len(enemies) >= enemy_system.BATCH_MIN_ENEMIES:
+            # Enemy state moves into arrays (reading the platforms registered above); the registry
+            # gets thin views for drawing and collisions. Sparse worlds keep the faster sprite path.
+            self.enemy_system = EnemySystem(self, enemies, ai_rng)
+            enemies = self.enemy_system.group()
+        entities.add(enemies, "enemies", "sprites")
+        entities.add(self.player, "sprites")
 
         self.player.spawn()
 
+        # Lay out the next world while this one is being played
+        self.prefetcher.request(self.level_number + 1)
+
+    def spawn_point(self):
+        """Where the player (re)spawns: the world start, or just behind them in endless mode."""
+        if self.endless_world:
+            return self.endless_world.spawn_point()
+        return PLAYER_SPAWN_X, PLAYER_SPAWN_Y
+
+    def on_cleared(self, kind, count=1):
+        """Count down what the final box waits for: 'enemies', 'coins' or 'boxes'."""
+        if self.final_box:
+            self.final_box.cleared(kind, count)
+
     def push_notification(self, text, duration=2500):
         self.notifications.append({
             "text": text,
@@ -138,7 +245,8 @@ class Game:
             self.upgrade_choices = self.get_upgrade_choices()
             self.selected_upgrade_index = 0  # Reset selection
         else:
-            self.generate_new_level()
+            if not self.endless:
+                self.generate_new_level()
             self.push_notification(f"World {self.level_number} intensifies")
 
     def get_upgrade_choices(self):
@@ -155,69 +263,101 @@ class Game:
             all_upgrades.append({"name": "Fireball", "desc": "Press X to shoot!"})
 
         # Return 3 random unique choices
-        import random
-        return random.sample(all_upgrades, min(3, len(all_upgrades)))
+        return self.upgrade_rng.sample(all_upgrades, min(3, len(all_upgrades)))
 
     def game_over(self):
         self.state = "game_over"
 
     def update_gameplay(self):
-        self.all_sprites.update()
-        self.midground.update()  # Update clouds for floating animation
-        self.camera.update(self.player)
-
-        coin_hits = pygame.sprite.spritecollide(self.player, self.coins, True)
-        for _ in coin_hits:
-            self.player.collect_coin()
-
-        powerup_hits = pygame.sprite.spritecollide(self.player, self.powerup_boxes, False)
-        for box in powerup_hits:
-            reward = box.hit()
-            if reward:
-                self.player.apply_powerup_reward(reward)
+        profiler = self.profiler
+        self.sim_clock.tick()
+        with profiler.section("update.sprites"):
+            self.entities.update()  # World sprites, then the drifting clouds
+            if isinstance(self.coins, CoinField):
+                self.coins.update()
+        with profiler.section("update.camera"):
+            self.camera.update(self.player)
+        if self.endless_world:
+            with profiler.section("update.stream"):
+                self.endless_world.update()
+
+        with profiler.section("update.coins"):
+            if isinstance(self.coins, CoinField):
+                coin_hits = self.coins.collect(self.player.rect)
+            else:
+                coin_hits = len(pygame.sprite.spritecollide(self.player, self.coins, True))
+            self.on_cleared("coins", coin_hits)
+            for _ in range(coin_hits):
+                self.player.collect_coin()
+
+        with profiler.section("update.powerups"):
+            powerup_hits = pygame.sprite.spritecollide(self.player, self.powerup_boxes, False)
+            for box in powerup_hits:
+                reward = box.hit()
+                if reward:
+                    self.player.apply_powerup_reward(reward)
 
     def draw_gameplay(self):
+        profiler = self.profiler
         self.screen.fill(self.current_theme.get("sky", SKY_BLUE))
+        camera = self.camera
+        camera.reset_cull_stats()
 
         # Draw background layer with parallax (mountains - slowest)
-        for sprite in self.background.sprites():
-            parallax_factor = getattr(sprite, 'parallax_factor', 0.2)
-            self.screen.blit(sprite.image, self.camera.apply_parallax(sprite, parallax_factor))
+        with profiler.section("draw.background"):
+            for sprite in self.background.sprites():
+                parallax_factor = getattr(sprite, 'parallax_factor', 0.2)
+                if camera.is_visible(sprite.rect, parallax_factor):
+                    self.screen.blit(sprite.image, camera.apply_parallax(sprite, parallax_factor))
 
         # Draw midground layer with parallax (hills and clouds - medium speed)
-        for sprite in self.midground.sprites():
-            parallax_factor = getattr(sprite, 'parallax_factor', 0.4)
-            self.screen.blit(sprite.image, self.camera.apply_parallax(sprite, parallax_factor))
-
-        # Draw gameplay sprites (platforms, coins, enemies, player - normal speed)
-        for sprite in self.all_sprites.sprites():
-            if not (sprite == self.player and self.player.invulnerable and self.player.blinking):
-                self.screen.blit(sprite.image, self.camera.apply(sprite))
-
-        # Draw foreground layer (end markers - normal speed)
-        for sprite in self.foreground.sprites():
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
-
-        self.draw_hud()
+        with profiler.section("draw.midground"):
+            for sprite in self.midground.sprites():
+                parallax_factor = getattr(sprite, 'parallax_factor', 0.4)
+                if camera.is_visible(sprite.rect, parallax_factor):
+                    self.screen.blit(sprite.image, camera.apply_parallax(sprite, parallax_factor))
+
+        # Draw pre-baked static platforms (normal speed)
+        with profiler.section("draw.terrain"):
+            self.terrain_layer.draw(self.screen, camera)
+
+        # Draw gameplay sprites (moving platforms, coins, enemies, player - normal speed)
+        with profiler.section("draw.sprites"):
+            # A coin field is drawn where the coin sprites sat in all_sprites: after moving platforms and boxes
+            coins = self.coins if isinstance(self.coins, CoinField) else None
+            for sprite in self.all_sprites.sprites():
+                if coins and not (isinstance(sprite, MovingPlatform) or sprite in self.powerup_boxes):
+                    coins.draw(self.screen, camera)
+                    coins = None
+                if not camera.is_visible(sprite.rect):
+                    continue
+                if not (sprite == self.player and self.player.invulnerable and self.player.blinking):
+                    self.screen.blit(sprite.image, camera.apply(sprite))
+
+        # Draw pre-baked foreground layer (end markers - normal speed)
+        with profiler.section("draw.overlay"):
+            self.overlay_layer.draw(self.screen, camera)
+
+        with profiler.section("draw.hud"):
+            self.draw_hud()
 
     def draw_hud(self):
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f'Score: {self.player.score}', True, WHITE)
+        score_text = self.text.render(f'Score: {self.player.score}', 36, WHITE)
         self.screen.blit(score_text, (10, 10))
 
-        lives_text = font.render(f'Lives: {self.player.lives}', True, WHITE)
+        lives_text = self.text.render(f'Lives: {self.player.lives}', 36, WHITE)
         self.screen.blit(lives_text, (10, 50))
 
-        level_text = font.render(f'World: {self.level_number}', True, WHITE)
+        level_text = self.text.render(f'World: {self.level_number}', 36, WHITE)
         self.screen.blit(level_text, (10, 90))
 
-        player_text = font.render(f'Player: {self.username}', True, WHITE)
+        player_text = self.text.render(f'Player: {self.username}', 36, WHITE)
         self.screen.blit(player_text, (10, 130))
 
         elapsed_time = (datetime.utcnow() - self.start_time).seconds
         minutes = elapsed_time // 60
         seconds = elapsed_time % 60
-        time_text = font.render(f'Time: {minutes:02d}:{seconds:02d}', True, WHITE)
+        time_text = self.text.render(f'Time: {minutes:02d}:{seconds:02d}', 36, WHITE)
         self.screen.blit(time_text, (10, 170))
 
         xp_ratio = self.player.xp / self.player.xp_to_next if self.player.xp_to_next else 0
@@ -226,39 +366,41 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), bar_rect, 2)
         fill_rect = pygame.Rect(12, 212, int((bar_width - 4) * xp_ratio), 16)
         pygame.draw.rect(self.screen, (255, 215, 0), fill_rect)
-        xp_text = font.render(f'Level {self.player.level}  XP {self.player.xp}/{self.player.xp_to_next}', True, WHITE)
+        xp_text = self.text.render(f'Level {self.player.level}  XP {self.player.xp}/{self.player.xp_to_next}', 36, WHITE)
         self.screen.blit(xp_text, (10, 240))
 
-        theme_text = font.render(f'Biome: {self.current_theme.get("name", "")}', True, WHITE)
+        theme_text = self.text.render(f'Biome: {self.current_theme.get("name", "")}', 36, WHITE)
         self.screen.blit(theme_text, (10, 280))
 
         now = pygame.time.get_ticks()
         self.notifications = [n for n in self.notifications if now - n["time"] < n["duration"]]
-        note_font = pygame.font.Font(None, 28)
         for index, note in enumerate(self.notifications):
-            text_surface = note_font.render(note["text"], True, YELLOW)
+            text_surface = self.text.render(note["text"], 28, YELLOW)
             self.screen.blit(text_surface, (WINDOW_WIDTH - text_surface.get_width() - 20, 20 + index * 28))
 
-    def draw_title_screen(self):
-        self.screen.fill((8, 12, 35))
-        for star in self.title_particles:
-            star["y"] += star["speed"]
-            if star["y"] > WINDOW_HEIGHT:
-                star["y"] = 0
-                star["x"] = random.uniform(0, WINDOW_WIDTH)
-            pygame.draw.circle(self.screen, (200, 220, 255), (int(star["x"]), int(star["y"])), star["size"])
-
-        title_font = pygame.font.Font(None, 96)
-        title = title_font.render("UltraLorenzo", True, WHITE)
+    def get_backdrop(self, name):
+        """Return a cached static menu surface, building it on first use."""
+        surface = self.backdrops.get(name)
+        if surface is None:
+            surface = getattr(self, f"build_{name}")()
+            self.backdrops[name] = surface
+        return surface
+
+    def build_title_background(self):
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        surface.fill((8, 12, 35))
+        return surface
+
+    def build_title_overlay(self):
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA).convert_alpha()
+        title = self.text.render("UltraLorenzo", 96, WHITE)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 3))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
-        subtitle_font = pygame.font.Font(None, 48)
-        subtitle = subtitle_font.render("Rogue Run", True, (255, 215, 0))
+        subtitle = self.text.render("Rogue Run", 48, (255, 215, 0))
         sub_rect = subtitle.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 3 + 60))
-        self.screen.blit(subtitle, sub_rect)
+        surface.blit(subtitle, sub_rect)
 
-        info_font = pygame.font.Font(None, 28)
         lines = [
             "Procedural worlds with escalating danger",
             "Defeat enemies & collect coins to gain XP",
@@ -270,83 +412,109 @@ class Game:
             "Press SPACE or ENTER to begin"
         ]
         for idx, line in enumerate(lines):
-            text = info_font.render(line, True, WHITE)
+            text = self.text.render(line, 28, WHITE)
             rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + idx * 30))
-            self.screen.blit(text, rect)
+            surface.blit(text, rect)
+        return surface
 
-    def draw_game_over(self):
-        self.screen.fill((15, 5, 20))
-        font_large = pygame.font.Font(None, 72)
-        text = font_large.render('Run Over', True, WHITE)
+    def build_game_over_background(self):
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        surface.fill((15, 5, 20))
+        text = self.text.render('Run Over', 72, WHITE)
         text_rect = text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 3))
-        self.screen.blit(text, text_rect)
+        surface.blit(text, text_rect)
+
+        restart_text = self.text.render('Press R to return to the title', 40, (255, 215, 0))
+        restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 120))
+        surface.blit(restart_text, restart_rect)
+        return surface
+
+    def build_level_up_background(self):
+        """Full-screen vertical gradient behind the level-up menu."""
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        for y in range(WINDOW_HEIGHT):
+            color_value = int(20 + (y / WINDOW_HEIGHT) * 40)
+            pygame.draw.line(surface, (color_value // 3, color_value // 4, color_value),
+                             (0, y), (WINDOW_WIDTH, y))
+        return surface
+
+    def build_level_up_title(self):
+        """LEVEL UP! title with its glow composited into a single surface."""
+        title = self.text.render("LEVEL UP!", 96, (255, 215, 0))
+        glow = self.text.render("LEVEL UP!", 96, (255, 150, 0))
+        surface = pygame.Surface((title.get_width() + 4, title.get_height() + 4), pygame.SRCALPHA).convert_alpha()
+        center = (surface.get_width() // 2, surface.get_height() // 2)
+        for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2)]:
+            glow_rect = glow.get_rect(center=(center[0] + offset[0], center[1] + offset[1]))
+            surface.blit(glow, glow_rect)
+        surface.blit(title, title.get_rect(center=center))
+        return surface
 
-        font = pygame.font.Font(None, 40)
-        score_text = font.render(f'Score: {self.player.score}', True, WHITE)
+    def draw_title_screen(self):
+        """Draw the title screen; returns the regions the animation touched."""
+        self.screen.blit(self.get_backdrop("title_background"), (0, 0))
+        dirty = []
+        for star in self.title_particles:
+            star["y"] += star["speed"]
+            if star["y"] > WINDOW_HEIGHT:
+                star["y"] = 0
+                star["x"] = random.uniform(0, WINDOW_WIDTH)
+            dirty.append(pygame.draw.circle(self.screen, (200, 220, 255), (int(star["x"]), int(star["y"])), star["size"]))
+
+        self.screen.blit(self.get_backdrop("title_overlay"), (0, 0))
+        return dirty
+
+    def draw_game_over(self):
+        """Draw the game over screen; nothing on it animates, so no regions are returned."""
+        self.screen.blit(self.get_backdrop("game_over_background"), (0, 0))
+
+        score_text = self.text.render(f'Score: {self.player.score}', 40, WHITE)
         score_rect = score_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 20))
         self.screen.blit(score_text, score_rect)
 
-        level_text = font.render(f'World Reached: {self.level_number}', True, WHITE)
+        level_text = self.text.render(f'World Reached: {self.level_number}', 40, WHITE)
         level_rect = level_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 20))
         self.screen.blit(level_text, level_rect)
 
-        xp_text = font.render(f'Hero Level: {self.player.level}', True, WHITE)
+        xp_text = self.text.render(f'Hero Level: {self.player.level}', 40, WHITE)
         xp_rect = xp_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 60))
         self.screen.blit(xp_text, xp_rect)
-
-        restart_text = font.render('Press R to return to the title', True, (255, 215, 0))
-        restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 120))
-        self.screen.blit(restart_text, restart_rect)
+        return []
 
     def draw_level_up(self):
-        """Draw the full-screen level-up menu with navigable list."""
-        # Full-screen gradient background
-        for y in range(WINDOW_HEIGHT):
-            color_value = int(20 + (y / WINDOW_HEIGHT) * 40)
-            pygame.draw.line(self.screen, (color_value // 3, color_value // 4, color_value),
-                           (0, y), (WINDOW_WIDTH, y))
+        """Draw the full-screen level-up menu; returns the particle and glow regions."""
+        # Pre-rendered full-screen gradient background
+        self.screen.blit(self.get_backdrop("level_up_background"), (0, 0))
 
         # Animated particles/stars
         current_time = pygame.time.get_ticks()
+        dirty = []
         for i in range(30):
             x = (i * 97 + current_time // 20) % WINDOW_WIDTH
             y = (i * 73) % WINDOW_HEIGHT
             size = 1 + (i % 3)
-            pygame.draw.circle(self.screen, (255, 255, 200, 100), (x, y), size)
-
-        # Title with glow effect
-        title_font = pygame.font.Font(None, 96)
-        title = title_font.render("LEVEL UP!", True, (255, 215, 0))
-        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
-        # Glow effect
-        glow = title_font.render("LEVEL UP!", True, (255, 150, 0))
-        for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2)]:
-            glow_rect = glow.get_rect(center=(WINDOW_WIDTH // 2 + offset[0], 100 + offset[1]))
-            self.screen.blit(glow, glow_rect)
-        self.screen.blit(title, title_rect)
+            dirty.append(pygame.draw.circle(self.screen, (255, 255, 200, 100), (x, y), size))
+
+        # Title with pre-composited glow effect
+        title = self.get_backdrop("level_up_title")
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH // 2, 100)))
 
         # Level info with stats
-        info_font = pygame.font.Font(None, 40)
-        level_text = info_font.render(f"Hero Level {self.player.level}", True, WHITE)
+        level_text = self.text.render(f"Hero Level {self.player.level}", 40, WHITE)
         level_rect = level_text.get_rect(center=(WINDOW_WIDTH // 2, 170))
         self.screen.blit(level_text, level_rect)
 
-        stats_font = pygame.font.Font(None, 28)
         stats = f"Score: {self.player.score}  |  Lives: {self.player.lives}  |  World: {self.level_number}"
-        stats_text = stats_font.render(stats, True, (200, 200, 200))
+        stats_text = self.text.render(stats, 28, (200, 200, 200))
         stats_rect = stats_text.get_rect(center=(WINDOW_WIDTH // 2, 210))
         self.screen.blit(stats_text, stats_rect)
 
         # Instructions
-        instruction_font = pygame.font.Font(None, 32)
-        instruction = instruction_font.render("Use UP/DOWN arrows to navigate, ENTER or SPACE to select", True, (180, 180, 180))
+        instruction = self.text.render("Use UP/DOWN arrows to navigate, ENTER or SPACE to select", 32, (180, 180, 180))
         instruction_rect = instruction.get_rect(center=(WINDOW_WIDTH // 2, 260))
         self.screen.blit(instruction, instruction_rect)
 
         # Draw upgrade options as a vertical list
-        option_font = pygame.font.Font(None, 48)
-        desc_font = pygame.font.Font(None, 32)
-
         box_width = 600
         box_height = 90
         spacing = 20
@@ -366,11 +534,18 @@ class Game:
                 # Draw glow
                 glow_rect = pygame.Rect(start_x - 5, y - 5, box_width + 10, box_height + 10)
                 pygame.draw.rect(self.screen, glow_color, glow_rect, border_radius=10)
+                # Only the 5px ring and the rounded box corners show the pulse
+                ring = 13
+                dirty.extend([
+                    pygame.Rect(glow_rect.left, glow_rect.top, glow_rect.width, ring),
+                    pygame.Rect(glow_rect.left, glow_rect.bottom - ring, glow_rect.width, ring),
+                    pygame.Rect(glow_rect.left, glow_rect.top, ring, glow_rect.height),
+                    pygame.Rect(glow_rect.right - ring, glow_rect.top, ring, glow_rect.height),
+                ])
                 pygame.draw.rect(self.screen, (100, 80, 140), box_rect, border_radius=8)
                 pygame.draw.rect(self.screen, (255, 215, 0), box_rect, 4, border_radius=8)
                 # Selection arrow
-                arrow_font = pygame.font.Font(None, 60)
-                arrow = arrow_font.render("▶", True, (255, 215, 0))
+                arrow = self.text.render("▶", 60, (255, 215, 0))
                 arrow_rect = arrow.get_rect(center=(start_x - 40, y + box_height // 2))
                 self.screen.blit(arrow, arrow_rect)
             else:
@@ -379,57 +554,103 @@ class Game:
                 pygame.draw.rect(self.screen, (120, 100, 140), box_rect, 2, border_radius=8)
 
             # Draw upgrade name (larger if selected)
-            name_font = option_font if is_selected else pygame.font.Font(None, 42)
-            name_text = name_font.render(upgrade["name"], True, WHITE if is_selected else (200, 200, 200))
+            name_size = 48 if is_selected else 42
+            name_text = self.text.render(upgrade["name"], name_size, WHITE if is_selected else (200, 200, 200))
             name_rect = name_text.get_rect(midleft=(start_x + 30, y + 30))
             self.screen.blit(name_text, name_rect)
 
             # Draw upgrade description
-            desc_text = desc_font.render(upgrade["desc"], True, (220, 220, 220) if is_selected else (150, 150, 150))
+            desc_text = self.text.render(upgrade["desc"], 32, (220, 220, 220) if is_selected else (150, 150, 150))
             desc_rect = desc_text.get_rect(midleft=(start_x + 30, y + 60))
             self.screen.blit(desc_text, desc_rect)
+        return dirty
+
+    def apply_input(self, key_state, pressed):
+        """Single entry point for a frame's input: key presses, then the held keys."""
+        for key in pressed:
+            self.handle_keydown(key)
+        self.key_state = key_state
+        if self.recorder:
+            self.recorder.record(key_state, pressed)
+
+    def handle_keydown(self, key):
+        """Dispatch a single key press for the current state."""
+        if key == pygame.K_ESCAPE:
+            self.running = False
+        elif key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        elif self.state == "playing":
+            if key == pygame.K_SPACE:
+                self.player.jump()
+            elif key == pygame.K_x:
+                self.player.shoot_fireball()
+        elif self.state == "title" and key in (pygame.K_RETURN, pygame.K_SPACE):
+            self.start_run()
+        elif self.state == "game_over" and key == pygame.K_r:
+            self.state = "title"
+        elif self.state == "level_up":
+            if key == pygame.K_UP:
+                self.selected_upgrade_index = (self.selected_upgrade_index - 1) % len(self.upgrade_choices)
+            elif key == pygame.K_DOWN:
+                self.selected_upgrade_index = (self.selected_upgrade_index + 1) % len(self.upgrade_choices)
+            elif key in (pygame.K_RETURN, pygame.K_SPACE):
+                self.apply_upgrade_choice(self.selected_upgrade_index)
 
     def run(self):
+        profiler = self.profiler
         while self.running:
             self.clock.tick(FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+            profiler.begin_frame()
+            with profiler.section("events"):
+                pressed = []
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
                         self.running = False
-                    elif self.state == "playing":
-                        if event.key == pygame.K_SPACE:
-                            self.player.jump()
-                        elif event.key == pygame.K_x:
-                            self.player.shoot_fireball()
-                    elif self.state == "title" and event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        self.start_run()
-                    elif self.state == "game_over" and event.key == pygame.K_r:
-                        self.state = "title"
-                    elif self.state == "level_up":
-                        if event.key == pygame.K_UP:
-                            self.selected_upgrade_index = (self.selected_upgrade_index - 1) % len(self.upgrade_choices)
-                        elif event.key == pygame.K_DOWN:
-                            self.selected_upgrade_index = (self.selected_upgrade_index + 1) % len(self.upgrade_choices)
-                        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                            self.apply_upgrade_choice(self.selected_upgrade_index)
+                    elif event.type == pygame.KEYDOWN:
+                        pressed.append(event.key)
+                self.apply_input(pygame.key.get_pressed(), pressed)
 
+            dirty = None
             if self.state == "playing":
                 self.update_gameplay()
                 self.draw_gameplay()
-            elif self.state == "title":
-                self.draw_title_screen()
-            elif self.state == "level_up":
-                self.draw_level_up()
             else:
-                self.draw_game_over()
-
-            pygame.display.flip()
-
+                with profiler.section("draw.menu"):
+                    if self.state == "title":
+                        dirty = self.draw_title_screen()
+                    elif self.state == "level_up":
+                        dirty = self.draw_level_up()
+                    else:
+                        dirty = self.draw_game_over()
+
+            profiler.draw_overlay(self.screen, self.text)
+            with profiler.section("flip"):
+                self.present(dirty)
+            profiler.end_frame()
+
+        profiler.close_csv()
+        if self.recorder:
+            self.recorder.close(self)
         pygame.quit()
         sys.exit()
 
+    def present(self, dirty):
+        """Show the frame: a full flip, or in dirty-rect mode only the menu regions that changed.
+
+        ``dirty`` lists the regions animated this frame (None during gameplay). The
+        regions animated last frame are pushed too so old positions get erased. Any
+        change of screen, menu selection or menu content, and any frame with the
+        profiler overlay visible or just hidden, flips fully.
+        """
+        view = (self.state, self.selected_upgrade_index, self.menu_redraws, self.profiler.overlay_visible)
+        if (self.dirty_rect_mode and dirty is not None and view == self.presented_view
+                and not self.profiler.overlay_visible):
+            pygame.display.update(self.previous_dirty + dirty)
+        else:
+            pygame.display.flip()
+        self.presented_view = view
+        self.previous_dirty = dirty or []
+
     def apply_upgrade_choice(self, choice_index):
         """Apply the selected upgrade and proceed."""
         upgrade = self.upgrade_choices[choice_index]
@@ -440,13 +661,45 @@ class Game:
         if self.player.pending_level_ups > 0:
             self.upgrade_choices = self.get_upgrade_choices()
             self.selected_upgrade_index = 0  # Reset selection for next screen
+            self.menu_redraws += 1  # Same state and index, but every name on screen changed
         else:
             # No more level-ups, continue to next level
             self.state = "playing"
-            self.generate_new_level()
+            if not self.endless:
+                self.generate_new_level()
             self.push_notification(f"World {self.level_number} intensifies")
 
 
-if __name__ == "__main__":
-    game = Game()
+def main():
+    parser = argparse.ArgumentParser(description="UltraLorenzo")
+    parser.add_argument("--profile", action="store_true", help="Show the frame timing overlay (toggle with F3)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="Write per-frame section timings to a CSV file")
+    parser.add_argument("--seed", type=int, help="Run seed; the same seed replays the same worlds and enemy behavior")
+    parser.add_argument("--level-pack", metavar="DIR", help="Play worlds from a directory of .ulvl files where present")
+    parser.add_argument("--world-cache", metavar="DIR", help="Cache generated worlds on disk, keyed by seed and difficulty")
+    parser.add_argument("--record", metavar="PATH", help="Log every frame's input and the seed for replay with controls.py")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="Update only the animated regions of menu screens instead of flipping the whole display")
+    parser.add_argument("--endless", action="store_true",
+                        help="One endless world generated ahead of the camera, getting harder with distance")
+    parser.add_argument("--check-updates", action="store_true",
+                        help="Fail loudly if any sprite is updated more than once in a frame")
+    args = parser.parse_args()
+
+    game = Game(seed=args.seed, level_pack=args.level_pack, world_cache=args.world_cache,
+                dirty_rects=args.dirty_rects, endless=args.endless,
+                check_updates=args.check_updates)
+    if args.record:
+        try:
+            game.recorder = InputRecorder(args.record, game)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.profile:
+        game.profiler.toggle_overlay()
+    if args.profile_csv:
+        game.profiler.open_csv(args.profile_csv)
     game.run()
+
+
+if __name__ == "__main__":
+    main()
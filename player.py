@@ -28,6 +28,7 @@ class Player(pygame.sprite.Sprite):
         # Stats
         self.score = 0
         self.lives = STARTING_LIVES
+        self.deaths = {}  # Lives lost per cause, for playtest statistics
         self.powerups = []
         self.invulnerable = False
         self.invulnerable_timer = 0
@@ -44,8 +45,7 @@ class Player(pygame.sprite.Sprite):
 
         # Fireball ability
         self.has_fireball = False
-        self.fireball_cooldown_timer = 0
-        self.fireballs = pygame.sprite.Group()
+        self.fireball_cooldown_timer = float("-inf")
         
     def load_images(self):
         # Create pixel art Lorenzo character (Mario-styled)
@@ -139,8 +139,7 @@ class Player(pygame.sprite.Sprite):
 
     def spawn(self):
         """Reset player position to spawn point"""
-        self.rect.x = PLAYER_SPAWN_X
-        self.rect.y = PLAYER_SPAWN_Y
+        self.rect.topleft = self.game.spawn_point()
         self.vel_x = 0
         self.vel_y = 0
         self.on_ground = False
@@ -150,7 +149,7 @@ class Player(pygame.sprite.Sprite):
         if not self.has_fireball or not FIREBALL_ENABLED:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.sim_clock.ms
         if current_time - self.fireball_cooldown_timer < FIREBALL_COOLDOWN:
             return
 
@@ -159,8 +158,7 @@ class Player(pygame.sprite.Sprite):
         spawn_x = self.rect.centerx + (20 * direction)
         spawn_y = self.rect.centery
         fireball = Fireball(spawn_x, spawn_y, direction, self.game)
-        self.fireballs.add(fireball)
-        self.game.all_sprites.add(fireball)
+        self.game.entities.add(fireball, "sprites")
     
     def jump(self):
         """Make the player jump if they're on the ground"""
@@ -172,13 +170,14 @@ class Player(pygame.sprite.Sprite):
                 self.vel_y = self.jump_power
             self.on_ground = False
     
-    def die(self):
-        """Handle player death"""
+    def die(self, cause="enemy"):
+        """Handle player death; ``cause`` is 'enemy' or 'fall' and is tallied in ``deaths``."""
         if not self.invulnerable:
             self.lives -= 1
+            self.deaths[cause] = self.deaths.get(cause, 0) + 1
             if self.lives > 0:
                 self.invulnerable = True
-                self.invulnerable_timer = pygame.time.get_ticks()
+                self.invulnerable_timer = self.game.sim_clock.ms
                 self.spawn()
             else:
                 self.game.game_over()
@@ -189,6 +188,7 @@ class Player(pygame.sprite.Sprite):
         if self.vel_y > 0:
             hits = pygame.sprite.spritecollide(self, self.game.enemies, True)
             if hits:
+                self.game.on_cleared("enemies", len(hits))
                 # Only kill enemy if we're above them
                 for hit in hits:
                     if self.rect.bottom < hit.rect.centery:
@@ -199,12 +199,12 @@ class Player(pygame.sprite.Sprite):
         # Check for side collisions with enemies
         hits = pygame.sprite.spritecollide(self, self.game.enemies, False)
         if hits and not self.invulnerable:
-            self.die()
+            self.die("enemy")
         return False
     
     def check_collisions_x(self):
         """Handle horizontal collisions with platforms"""
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platform_index.collide(self)
         if hits:
             if self.vel_x > 0:
                 self.rect.right = hits[0].rect.left
@@ -213,7 +213,7 @@ class Player(pygame.sprite.Sprite):
                 
     def check_collisions_y(self):
         """Handle vertical collisions with platforms"""
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platform_index.collide(self)
         if hits:
             if self.vel_y > 0:
                 self.rect.bottom = hits[0].rect.top
@@ -226,7 +226,7 @@ class Player(pygame.sprite.Sprite):
     def handle_invulnerability(self):
         """Update invulnerability state and blinking effect"""
         if self.invulnerable:
-            current_time = pygame.time.get_ticks()
+            current_time = self.game.sim_clock.ms
             if current_time - self.invulnerable_timer > PLAYER_INVULNERABILITY_TIME:
                 self.invulnerable = False
                 self.blinking = False
@@ -260,18 +260,15 @@ class Player(pygame.sprite.Sprite):
         # Update invulnerability
         self.handle_invulnerability()
 
-        # Update fireballs
-        self.fireballs.update()
-
         # Apply gravity
         self.vel_y += GRAVITY
 
         # Check if fallen off the map
         if self.rect.top > LEVEL_HEIGHT:
-            self.die()
+            self.die("fall")
         
         # Get keyboard input
-        keys = pygame.key.get_pressed()
+        keys = self.game.key_state
         self.walking = False
 
         # Check if running (Shift key held)
@@ -327,8 +324,8 @@ class Player(pygame.sprite.Sprite):
         self.check_enemy_collision()
         
         # Keep player on screen horizontally
-        if self.rect.left < 0:
-            self.rect.left = 0
+        if self.rect.left < self.game.world_left:
+            self.rect.left = self.game.world_left
 
         # Note: Level completion now triggered by collecting final box
 
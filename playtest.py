@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Workers would each print the banner
+from settings import FPS, LEVEL_WIDTH
+from headless import HeadlessRunner, SCRIPTS
+
+
+def play_world(job):
+    """Process-pool worker: play one ``(seed, world, policy, max_frames)`` attempt headlessly.
+
+    The attempt ends when the world is cleared, the run is over or the frame
+    budget runs out. Each job builds its own Game, so workers share nothing.
+    """
+    seed, world, policy, max_frames = job
+    from main import Game
+    game = Game(headless=True, seed=seed)
+    game.start_run()
+    if world > 1:
+        game.level_number = world
+        game.generate_new_level()
+    coins_total = len(game.coins)
+    totals = dict(game.final_box.remaining)  # Enemies, coins and boxes the final box waits on
+    remaining = totals
+
+    runner = HeadlessRunner(game, SCRIPTS[policy], auto_upgrade=False)
+    furthest_x = game.player.rect.right
+    while runner.frames < max_frames and game.state == "playing" and game.level_number == world:
+        runner.step()
+        if game.level_number == world:
+            furthest_x = max(furthest_x, game.player.rect.right)
+            remaining = dict(game.final_box.remaining)
+    cleared = game.level_number > world
+    if cleared:
+        furthest_x = LEVEL_WIDTH
+        remaining = {kind: 0 for kind in totals}
+    game.prefetcher.cancel()
+
+    return {
+        "seed": seed,
+        "world": world,
+        "policy": policy,
+        "cleared": cleared,
+        "game_over": game.state == "game_over",
+        "frames": runner.frames,
+        "deaths": dict(game.player.deaths),
+        "coins_collected": coins_total if cleared else coins_total - len(game.coins),
+        "coins_total": coins_total,
+        "enemies_killed": totals["enemies"] - remaining["enemies"],
+        "enemies_total": totals["enemies"],
+        "boxes_opened": totals["boxes"] - remaining["boxes"],
+        "boxes_total": totals["boxes"],
+        "furthest_x": furthest_x,
+        "score": game.player.score,
+    }
+
+
+def play_worlds(jobs, processes=None, chunksize=1):
+    """Fan attempts out across a process pool; results come back in job order."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(play_world, jobs, chunksize=chunksize))
+
+
+def aggregate(results):
+    """Per (world, policy) clear rate, deaths by cause, progress shares and frames to clear.
+
+    The shares (coins, enemies, boxes, distance) measure progress on attempts
+    that never clear, since the final box needs everything collected first.
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result["world"], result["policy"]), []).append(result)
+
+    summary = []
+    for (world, policy), runs in sorted(groups.items()):
+        deaths = {}
+        for run in runs:
+            for cause, count in run["deaths"].items():
+                deaths[cause] = deaths.get(cause, 0) + count
+        clear_frames = [run["frames"] for run in runs if run["cleared"]]
+        coins_total = sum(run["coins_total"] for run in runs)
+        enemies_total = sum(run["enemies_total"] for run in runs)
+        boxes_total = sum(run["boxes_total"] for run in runs)
+        summary.append({
+            "world": world,
+            "policy": policy,
+            "runs": len(runs),
+            "clear_rate": len(clear_frames) / len(runs),
+            "game_over_rate": sum(run["game_over"] for run in runs) / len(runs),
+            "deaths": deaths,
+            "deaths_per_run": sum(deaths.values()) / len(runs),
+            "coins_collected": sum(run["coins_collected"] for run in runs) / len(runs),
+            "coin_share": sum(run["coins_collected"] for run in runs) / coins_total if coins_total else 1.0,
+            "enemy_kill_share": sum(run["enemies_killed"] for run in runs) / enemies_total if enemies_total else 1.0,
+            "box_share": sum(run["boxes_opened"] for run in runs) / boxes_total if boxes_total else 1.0,
+            "furthest_x_mean": statistics.mean(run["furthest_x"] for run in runs),
+            "distance_share": statistics.mean(min(run["furthest_x"], LEVEL_WIDTH) for run in runs) / LEVEL_WIDTH,
+            "frames_to_clear_mean": statistics.mean(clear_frames) if clear_frames else None,
+            "frames_to_clear_median": statistics.median(clear_frames) if clear_frames else None,
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many seeded worlds headlessly in parallel and report balance stats.")
+    parser.add_argument("--seeds", type=int, default=20, help="Number of run seeds (0..N-1)")
+    parser.add_argument("--worlds", type=int, default=10, help="Worlds 1..N per seed")
+    parser.add_argument("--policies", default="run-right,hop-gaps,collect",
+                        help=f"Comma-separated bot policies from: {', '.join(sorted(SCRIPTS))}")
+    parser.add_argument("--max-frames", type=int, default=FPS * 120, help="Frame budget per world attempt")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", metavar="PATH", help="Also write per-run results and the summary as JSON")
+    args = parser.parse_args()
+
+    policies = [policy.strip() for policy in args.policies.split(",") if policy.strip()]
+    unknown = [policy for policy in policies if policy not in SCRIPTS]
+    if unknown:
+        parser.error(f"unknown policies: {', '.join(unknown)}")
+
+    jobs = [(seed, world, policy, args.max_frames)
+            for seed in range(args.seeds) for world in range(1, args.worlds + 1) for policy in policies]
+    start = time.perf_counter()
+    results = play_worlds(jobs, args.processes)
+    elapsed = time.perf_counter() - start
+    summary = aggregate(results)
+
+    frames = sum(result["frames"] for result in results)
+    print(f"Played {len(results)} attempts ({frames} frames) in {elapsed:.2f}s: "
+          f"{len(results) / elapsed:.1f} attempts/s, {frames / elapsed:.0f} simulated frames/s "
+          f"on {args.processes or os.cpu_count()} processes")
+    print(f"{'world':>5} {'policy':<10} {'clear':>6} {'over':>6} {'deaths':>7} {'coins':>6} {'kills':>6} "
+          f"{'boxes':>6} {'dist':>6}  causes")
+    for row in summary:
+        causes = ", ".join(f"{cause} {count}" for cause, count in sorted(row["deaths"].items()))
+        print(f"{row['world']:>5} {row['policy']:<10} {row['clear_rate']:>6.0%} {row['game_over_rate']:>6.0%} "
+              f"{row['deaths_per_run']:>7.2f} {row['coin_share']:>6.0%} {row['enemy_kill_share']:>6.0%} "
+              f"{row['box_share']:>6.0%} {row['distance_share']:>6.0%}  {causes}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"summary": summary, "runs": results}, handle, indent=2)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
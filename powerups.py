@@ -1,6 +1,6 @@
 import pygame
-import random
 from settings import *
+from atlas import ATLAS
 
 POWERUP_REWARDS = [
     {"type": "xp", "amount": 40, "label": "Wisdom Fragment"},
@@ -19,23 +19,26 @@ class PowerUp(pygame.sprite.Sprite):
         self.rect.y = y
 
 class PowerUpBox(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, game, rng):
         super().__init__()
+        self.game = game
+        self.rng = rng
         self.image = pygame.Surface((POWERUP_SIZE, POWERUP_SIZE))
         self.image.fill(YELLOW)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
-        self.hit_time = 0
+        self.hit_time = float("-inf")
         self.has_powerup = True
 
     def hit(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.sim_clock.ms
         if self.has_powerup and current_time - self.hit_time > 1000:
             self.has_powerup = False
             self.hit_time = current_time
             self.image.fill((100, 100, 100))
-            return random.choice(POWERUP_REWARDS)
+            self.game.on_cleared("boxes")
+            return self.rng.choice(POWERUP_REWARDS)
         return None
 
 
@@ -46,63 +49,75 @@ class FinalBox(pygame.sprite.Sprite):
         super().__init__()
         self.game = game
         self.size = POWERUP_SIZE
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        self.frames = ATLAS.get("final_box", self.create_sprite_frames).frames  # [waiting, ready]
+        self.image = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.has_powerup = True
-        self.hit_time = 0
-        self.animation_offset = 0
-        self.update_appearance()
+        self.hit_time = float("-inf")
+        self.remaining = {"enemies": 0, "coins": 0, "boxes": 0}
+        self.ready = False
+        self.refresh()
 
-    def is_ready(self):
-        """Check if all enemies, coins, and powerup boxes are collected."""
-        enemies_cleared = len(self.game.enemies) == 0
-        coins_collected = len(self.game.coins) == 0
-        boxes_collected = all(not box.has_powerup for box in self.game.powerup_boxes if box != self)
-        return enemies_cleared and coins_collected and boxes_collected
+    @staticmethod
+    def create_sprite_frames():
+        """Pre-bake the dashed 'not ready' outline and the solid golden 'ready' box."""
+        size = POWERUP_SIZE
+        waiting = pygame.Surface((size, size), pygame.SRCALPHA)
+        dash_color = (150, 150, 150)
+        dash_length = 4
+        gap_length = 3
+        # Top edge
+        for x in range(0, size, dash_length + gap_length):
+            pygame.draw.line(waiting, dash_color, (x, 0), (min(x + dash_length, size), 0), 2)
+        # Bottom edge
+        for x in range(0, size, dash_length + gap_length):
+            pygame.draw.line(waiting, dash_color, (x, size - 1), (min(x + dash_length, size), size - 1), 2)
+        # Left edge
+        for y in range(0, size, dash_length + gap_length):
+            pygame.draw.line(waiting, dash_color, (0, y), (0, min(y + dash_length, size)), 2)
+        # Right edge
+        for y in range(0, size, dash_length + gap_length):
+            pygame.draw.line(waiting, dash_color, (size - 1, y), (size - 1, min(y + dash_length, size)), 2)
 
-    def update_appearance(self):
-        """Update the box appearance based on ready state."""
-        self.image.fill((0, 0, 0, 0))  # Clear with transparency
+        ready = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(ready, (255, 215, 0), (0, 0, size, size))
+        pygame.draw.rect(ready, (255, 255, 100), (2, 2, size - 4, size - 4), 3)
+        # Draw sparkle effect
+        sparkle_color = (255, 255, 255)
+        pygame.draw.circle(ready, sparkle_color, (size // 4, size // 4), 2)
+        pygame.draw.circle(ready, sparkle_color, (3 * size // 4, 3 * size // 4), 2)
+        return [waiting, ready]
 
-        if self.is_ready():
-            # Solid golden box when ready
-            pygame.draw.rect(self.image, (255, 215, 0), (0, 0, self.size, self.size))
-            pygame.draw.rect(self.image, (255, 255, 100), (2, 2, self.size - 4, self.size - 4), 3)
-            # Draw sparkle effect
-            sparkle_color = (255, 255, 255)
-            pygame.draw.circle(self.image, sparkle_color, (self.size // 4, self.size // 4), 2)
-            pygame.draw.circle(self.image, sparkle_color, (3 * self.size // 4, 3 * self.size // 4), 2)
-        else:
-            # Dashed outline when not ready
-            dash_color = (150, 150, 150)
-            dash_length = 4
-            gap_length = 3
+    def track(self, enemies, coins, boxes):
+        """Start counting down what is left to clear in this world."""
+        self.remaining["enemies"] = enemies
+        self.remaining["coins"] = coins
+        self.remaining["boxes"] = boxes
+        self.refresh()
 
-            # Top edge
-            for x in range(0, self.size, dash_length + gap_length):
-                pygame.draw.line(self.image, dash_color, (x, 0), (min(x + dash_length, self.size), 0), 2)
-            # Bottom edge
-            for x in range(0, self.size, dash_length + gap_length):
-                pygame.draw.line(self.image, dash_color, (x, self.size - 1), (min(x + dash_length, self.size), self.size - 1), 2)
-            # Left edge
-            for y in range(0, self.size, dash_length + gap_length):
-                pygame.draw.line(self.image, dash_color, (0, y), (0, min(y + dash_length, self.size)), 2)
-            # Right edge
-            for y in range(0, self.size, dash_length + gap_length):
-                pygame.draw.line(self.image, dash_color, (self.size - 1, y), (self.size - 1, min(y + dash_length, self.size)), 2)
+    def cleared(self, kind, count=1):
+        """Called whenever enemies are defeated, coins collected or boxes opened."""
+        if count:
+            self.remaining[kind] -= count
+            self.refresh()
 
-    def update(self):
-        """Update animation."""
-        self.animation_offset += 1
-        if self.animation_offset % 10 == 0:  # Update appearance periodically
-            self.update_appearance()
+    def refresh(self):
+        """Swap the pre-baked image only when readiness flips."""
+        ready = not any(self.remaining.values())
+        if ready != self.ready:
+            self.ready = ready
+            self.image = self.frames[ready]
+
+    def is_ready(self):
+        """Check if all enemies, coins, and powerup boxes are collected."""
+        return self.ready
 
     def hit(self):
         """Attempt to collect the box and complete the level."""
         if self.is_ready() and self.has_powerup:
-            current_time = pygame.time.get_ticks()
+            current_time = self.game.sim_clock.ms
             if current_time - self.hit_time > 1000:
                 self.has_powerup = False
                 self.hit_time = current_time
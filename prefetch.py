@@ -0,0 +1,48 @@
+import threading
+
+
+class LevelPrefetcher:
+    """Plans the next world on a worker thread while the current one is played.
+
+    Only the planner (``Game.plan_world``: cache lookup plus
+    ``LevelGenerator.plan_level``) runs off the main thread; the returned plan
+    is plain data, and sprites and surfaces are still built on the main thread
+    when the plan is handed over.
+    """
+
+    def __init__(self, planner):
+        self.planner = planner
+        self.world = None
+        self.plan = None
+        self.error = None
+        self.thread = None
+
+    def request(self, world):
+        """Start planning ``world`` in the background, replacing any older request."""
+        self.cancel()
+        self.world = world
+        self.thread = threading.Thread(target=self._plan, args=(world,),
+                                       name=f"prefetch-world-{world}", daemon=True)
+        self.thread.start()
+
+    def _plan(self, world):
+        try:
+            self.plan = self.planner(world)
+        except Exception as exc:  # Surface the failure on the main thread instead of losing it
+            self.error = exc
+
+    def take(self, world):
+        """Return the finished plan for ``world``, or None if it was never requested."""
+        if self.world != world or self.thread is None:
+            return None
+        self.thread.join()
+        plan, error = self.plan, self.error
+        self.world = self.plan = self.error = self.thread = None
+        if error is not None:
+            raise error
+        return plan
+
+    def cancel(self):
+        if self.thread is not None:
+            self.thread.join()
+        self.world = self.plan = self.error = self.thread = None
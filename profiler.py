@@ -0,0 +1,180 @@
+import csv
+import time
+from collections import deque
+import pygame
+from text_cache import TextCache
+
+PROFILE_WINDOW = 240  # Frames kept for the rolling averages and p99s
+OVERLAY_TEXT_CACHE_SIZE = 64  # The overlay's numbers change every frame; keep them out of the game's text cache
+PROFILE_SECTIONS = [
+    "events",
+    "update.enemies",
+    "update.sprites",
+    "update.camera",
+    "update.stream",
+    "update.coins",
+    "update.powerups",
+    "draw.background",
+    "draw.midground",
+    "draw.terrain",
+    "draw.sprites",
+    "draw.overlay",
+    "draw.hud",
+    "draw.menu",
+    "flip",
+    "frame",
+]
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start", "nested")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+        self.nested = 0.0  # Time spent in sections opened inside this one
+
+    def __enter__(self):
+        self.profiler.open_sections.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        open_sections = self.profiler.open_sections
+        open_sections.pop()
+        if open_sections:
+            open_sections[-1].nested += elapsed
+        # Exclusive time, so sections never count the same work twice and add up to at most the frame
+        self.profiler.record(self.name, elapsed - self.nested)
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """Per-frame timing hooks with a rolling on-screen summary.
+
+    Code wraps work in ``with profiler.section("name"):``; when profiling is
+    off that returns a shared no-op context so the hooks cost almost nothing.
+    A section nested in another is subtracted from it, so every section
+    reports exclusive time.
+    """
+
+    def __init__(self, sections=PROFILE_SECTIONS, window=PROFILE_WINDOW):
+        self.sections = list(sections)
+        self.samples = {name: deque(maxlen=window) for name in self.sections}
+        self.current = {}
+        self.open_sections = []
+        self.overlay_visible = False
+        self.overlay_text = None  # Private TextCache sharing the game's fonts, made on first draw
+        self.enabled = False
+        self.frame_index = 0
+        self.frame_start = None
+        self.csv_file = None
+        self.csv_writer = None
+        self.csv_columns = []
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        if self.frame_start is not None:
+            self.record("frame", time.perf_counter() - self.frame_start)
+            self.frame_start = None
+        for name, seconds in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.samples["frame"].maxlen)
+                self.sections.append(name)
+            samples.append(seconds)
+        if self.csv_writer is not None:
+            row = [self.frame_index]
+            row.extend(f"{self.current[name] * 1000:.4f}" if name in self.current else ""
+                       for name in self.csv_columns)
+            self.csv_writer.writerow(row)
+        self.current = {}
+        self.frame_index += 1
+
+    def stats(self, name):
+        """Return (average_ms, p99_ms) over the rolling window, or None if unsampled."""
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return sum(ordered) / len(ordered) * 1000, p99 * 1000
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.refresh_enabled()
+
+    def refresh_enabled(self):
+        self.enabled = self.overlay_visible or self.csv_writer is not None
+        if not self.enabled:
+            self.current = {}
+            self.frame_start = None
+
+    def open_csv(self, path):
+        """Dump every frame's section timings (milliseconds) to ``path``."""
+        self.close_csv()
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_columns = list(self.sections)
+        self.csv_writer.writerow(["frame"] + [f"{name}_ms" for name in self.csv_columns])
+        self.refresh_enabled()
+
+    def close_csv(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+        self.csv_file = None
+        self.csv_writer = None
+        self.refresh_enabled()
+
+    def draw_overlay(self, surface, text_cache):
+        """Draw the timing panel, rendering through a small private cache built on ``text_cache``'s fonts."""
+        if not self.overlay_visible:
+            return
+        if self.overlay_text is None or self.overlay_text.fonts is not text_cache.fonts:
+            self.overlay_text = TextCache(text_cache.fonts, OVERLAY_TEXT_CACHE_SIZE)
+        text_cache = self.overlay_text
+        rows = []
+        for name in self.sections:
+            result = self.stats(name)
+            if result is not None:
+                rows.append((name, f"{result[0]:.2f}", f"{result[1]:.2f}"))
+        line_height = 18
+        columns = (8, 170, 235)
+        panel = pygame.Surface((300, (len(rows) + 1) * line_height + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for column, label in zip(columns, ("section", "avg ms", "p99 ms")):
+            panel.blit(text_cache.render(label, 20, (255, 215, 0)), (column, 5))
+        for index, row in enumerate(rows):
+            y = 5 + (index + 1) * line_height
+            for column, value in zip(columns, row):
+                panel.blit(text_cache.render(value, 20, (230, 230, 230)), (column, y))
+        surface.blit(panel, (surface.get_width() - panel.get_width() - 10,
+                             surface.get_height() - panel.get_height() - 10))
@@ -0,0 +1,257 @@
+import argparse
+import math
+import time
+from collections import namedtuple
+from settings import *
+from layout import ENEMY_KINDS, difficulty_profile, generate_layout
+from rng import RunRandom
+
+# Reachability analysis for generated layouts. Jump arcs are simulated with the
+# same per-frame integration as Player.update (including pygame's rounding of
+# rect positions) and folded into an envelope table indexed by height, so
+# checking a layout is just table lookups over the platform graph. Pure data,
+# like layout.py: no pygame.
+
+# Movement limits the analysis assumes. Sky Shoes only raise ``jump_power``,
+# which is the standing/walking jump; a running jump always uses
+# JUMP_POWER_RUNNING. Fleet Boots raise both speeds.
+PlayerCaps = namedtuple("PlayerCaps", ["walk_speed", "run_speed", "jump_power"])
+BASE_CAPS = PlayerCaps(PLAYER_WALK_SPEED, PLAYER_RUN_SPEED, JUMP_POWER)
+
+FLYER_MAX_AMPLITUDE = 60  # FlyerEnemy picks its wave amplitude in 30..60
+FLYER_PATROL = 150  # FlyerEnemy patrols this far either side of its spawn x
+
+
+def _snap(value):
+    """Round like assigning a float to a pygame.Rect attribute (half away from zero)."""
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+def simulate_arc(jump_power, speed):
+    """Per-frame (dx, rise) of the feet for a jump taken at full ``speed`` while holding forward."""
+    x = y = 0
+    vel_y = jump_power
+    arc = [(0, 0)]
+    while y < LEVEL_HEIGHT:
+        vel_y += GRAVITY
+        x = _snap(x + speed)
+        y = _snap(y + vel_y)
+        arc.append((x, -y))
+    return arc
+
+
+class Envelope:
+    """How far the player can get horizontally at each height relative to the takeoff floor.
+
+    ``landing[h]`` is the largest horizontal distance at which the feet can
+    come down onto a surface ``h`` pixels above the takeoff surface (-1 when
+    impossible); ``touch[h]`` the largest distance at which the feet can pass
+    height ``h`` at all, rising or falling. Shorter distances are always
+    reachable by easing off in the air.
+    """
+
+    def __init__(self, caps=BASE_CAPS):
+        self.caps = caps
+        arcs = [simulate_arc(JUMP_POWER_RUNNING, caps.run_speed), simulate_arc(caps.jump_power, caps.walk_speed)]
+        self.max_rise = max(rise for arc in arcs for _, rise in arc)
+        self.min_rise = -LEVEL_HEIGHT
+        size = self.max_rise - self.min_rise + 1
+        self.landing = [-1] * size
+        self.touch = [-1] * size
+        for arc in arcs:
+            for (prev_x, prev_rise), (x, rise) in zip(arc, arc[1:]):
+                low, high = sorted((prev_rise, rise))
+                for height in range(max(low, self.min_rise), high + 1):
+                    index = height - self.min_rise
+                    self.touch[index] = max(self.touch[index], prev_x)
+                    if rise < height <= prev_rise:
+                        self.landing[index] = max(self.landing[index], x)
+        self.max_reach = max(self.touch)
+
+    def landing_reach(self, height):
+        if not self.min_rise <= height <= self.max_rise:
+            return -1
+        return self.landing[height - self.min_rise]
+
+    def touch_reach(self, low, high):
+        """Largest distance at which the feet can be anywhere in ``low..high``."""
+        low = max(low, self.min_rise)
+        high = min(high, self.max_rise)
+        if low > high:
+            return -1
+        return max(self.touch[low - self.min_rise:high - self.min_rise + 1])
+
+
+_ENVELOPES = {}
+
+
+def envelope_for(caps=BASE_CAPS):
+    envelope = _ENVELOPES.get(caps)
+    if envelope is None:
+        envelope = _ENVELOPES[caps] = Envelope(caps)
+    return envelope
+
+
+def _span_distance(left_a, right_a, left_b, right_b):
+    """Horizontal distance the player must cover to go from overlapping span A to overlapping span B."""
+    return max(0, left_b - right_a - PLAYER_WIDTH + 2, left_a - right_b - PLAYER_WIDTH + 2)
+
+
+def _platform_distance(a, b):
+    # Moving platforms are treated as their whole sweep: the player can wait for them
+    return max(0, b.min_x - a.max_right, a.min_x - b.max_right)
+
+
+class ReachabilityReport:
+    """What the player can get to in a layout; ``solvable`` means the world can be cleared."""
+
+    def __init__(self, reachable, coins, boxes, enemies, final_box):
+        self.reachable = reachable  # Indices of platforms the player can stand on
+        self.unreachable_coins = coins
+        self.unreachable_boxes = boxes
+        self.unreachable_enemies = enemies
+        self.final_box = final_box
+
+    @property
+    def solvable(self):
+        return (self.final_box and not self.unreachable_coins and not self.unreachable_boxes
+                and not self.unreachable_enemies)
+
+    def problems(self):
+        problems = [f"coin {index} is unreachable" for index in self.unreachable_coins]
+        problems += [f"box {index} is unreachable" for index in self.unreachable_boxes]
+        problems += [f"enemy {index} is unreachable" for index in self.unreachable_enemies]
+        if not self.final_box:
+            problems.append("final box is unreachable")
+        return problems
+
+
+def start_platform(platforms):
+    """Index of the platform the player lands on after spawning, or None."""
+    best = None
+    for index, platform in enumerate(platforms):
+        if (platform.min_x < PLAYER_SPAWN_X + PLAYER_WIDTH and PLAYER_SPAWN_X < platform.max_right
+                and platform.y >= PLAYER_SPAWN_Y + PLAYER_HEIGHT):
+            if best is None or platform.y < platforms[best].y:
+                best = index
+    return best
+
+
+def reachable_platforms(platforms, envelope):
+    start = start_platform(platforms)
+    if start is None:
+        return set()
+    reachable = {start}
+    frontier = [start]
+    while frontier:
+        source = platforms[frontier.pop()]
+        for index, target in enumerate(platforms):
+            if index in reachable:
+                continue
+            distance = _platform_distance(source, target)
+            if distance <= envelope.max_reach and envelope.landing_reach(source.y - target.y) >= distance:
+                reachable.add(index)
+                frontier.append(index)
+    return reachable
+
+
+def can_touch(platforms, reachable, envelope, x, y, width, height):
+    """Whether the player's body can overlap the rect from some reachable platform."""
+    for index in reachable:
+        platform = platforms[index]
+        distance = _span_distance(platform.min_x, platform.max_right, x, x + width)
+        if distance > envelope.max_reach:
+            continue
+        # Object occupies rises low..high above this platform; the body spans feet..feet+PLAYER_HEIGHT
+        low = platform.y - (y + height)
+        high = platform.y - y
+        if envelope.touch_reach(low - PLAYER_HEIGHT + 1, high - 1) >= distance:
+            return True
+    return False
+
+
+def analyze_layout(layout, caps=BASE_CAPS):
+    """Check that the final box, every coin, box and enemy can be reached with ``caps``."""
+    envelope = envelope_for(caps)
+    platforms = layout.platforms
+    reachable = reachable_platforms(platforms, envelope)
+
+    def touchable(x, y, width, height):
+        return can_touch(platforms, reachable, envelope, x, y, width, height)
+
+    coins = [index for index, coin in enumerate(layout.coins)
+             if not touchable(coin.x, coin.y, COIN_SIZE, COIN_SIZE)]
+    boxes = [index for index, box in enumerate(layout.boxes)
+             if not touchable(box.x, box.y, POWERUP_SIZE, POWERUP_SIZE)]
+    enemies = []
+    for index, enemy in enumerate(layout.enemies):
+        if ENEMY_KINDS[enemy.kind] == "flyer":
+            # Anywhere along its patrol and wave
+            ok = touchable(enemy.x - FLYER_PATROL, enemy.y - FLYER_MAX_AMPLITUDE,
+                           ENEMY_WIDTH + FLYER_PATROL * 2, ENEMY_HEIGHT + FLYER_MAX_AMPLITUDE * 2)
+        else:
+            ok = touchable(enemy.x, enemy.y, ENEMY_WIDTH, ENEMY_HEIGHT)
+        if not ok:
+            enemies.append(index)
+    final_box = touchable(layout.final_box.x, layout.final_box.y, POWERUP_SIZE, POWERUP_SIZE)
+    return ReachabilityReport(reachable, coins, boxes, enemies, final_box)
+
+
+def repair_layout(layout, report):
+    """Drop the coins, boxes and enemies the player cannot reach so the final box can unlock."""
+    coins = set(report.unreachable_coins)
+    boxes = set(report.unreachable_boxes)
+    enemies = set(report.unreachable_enemies)
+    return layout._replace(
+        coins=[coin for index, coin in enumerate(layout.coins) if index not in coins],
+        boxes=[box for index, box in enumerate(layout.boxes) if index not in boxes],
+        enemies=[enemy for index, enemy in enumerate(layout.enemies) if index not in enemies],
+    )
+
+
+def generate_solvable_layout(difficulty_profile, rng, caps=BASE_CAPS, attempts=4):
+    """Generate a layout, rejecting ones whose final box is out of reach and repairing the rest.
+
+    Retries draw from the same ``rng``, so the result is still reproducible.
+    If every attempt is rejected the last one is repaired and returned anyway.
+    """
+    for _ in range(attempts):
+        layout = generate_layout(difficulty_profile, rng)
+        report = analyze_layout(layout, caps)
+        if report.final_box:
+            break
+    if report.solvable:
+        return layout
+    return repair_layout(layout, report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check generated worlds for reachability with base movement.")
+    parser.add_argument("--seeds", type=int, default=100, help="Number of run seeds (0..N-1)")
+    parser.add_argument("--worlds", type=int, default=30, help="Worlds 1..N per seed")
+    args = parser.parse_args()
+
+    counts = {"solvable": 0, "repairable": 0, "rejected": 0}
+    examples = []
+    start = time.perf_counter()
+    for seed in range(args.seeds):
+        run_random = RunRandom(seed)
+        for world in range(1, args.worlds + 1):
+            layout = generate_layout(difficulty_profile(world), run_random.stream("level", world))
+            report = analyze_layout(layout)
+            if report.solvable:
+                counts["solvable"] += 1
+                continue
+            counts["repairable" if report.final_box else "rejected"] += 1
+            if len(examples) < 10:
+                examples.append((seed, world, report.problems()))
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"Analyzed {total} layouts in {elapsed:.2f}s ({total / elapsed:.0f} worlds/s)")
+    print(", ".join(f"{name}: {count} ({count / total:.1%})" for name, count in counts.items()))
+    for seed, world, problems in examples:
+        print(f"  seed {seed} world {world}: {'; '.join(problems[:4])}")
+
+
+if __name__ == "__main__":
+    main()
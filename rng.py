@@ -0,0 +1,20 @@
+import random
+
+
+def new_seed():
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+class RunRandom:
+    """Hands out independent, reproducible RNG streams derived from one run seed.
+
+    Each subsystem asks for its own named stream (optionally per world), so
+    consuming numbers in one place never shifts the sequence seen by another.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = new_seed() if seed is None else seed
+
+    def stream(self, name, *parts):
+        key = ":".join(str(part) for part in (self.seed, name) + parts)
+        return random.Random(key)
@@ -0,0 +1,28 @@
+from settings import FPS
+
+
+class SimClock:
+    """Game-owned clock that advances one fixed step per simulated frame.
+
+    Gameplay timers read ``ms`` instead of ``pygame.time.get_ticks()`` so the
+    simulation behaves the same whether it runs at 60 FPS, drops frames or is
+    stepped flat out by the headless runner.
+    """
+
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.frame = 0
+
+    @property
+    def ms(self):
+        return self.frame * 1000 // self.fps
+
+    @property
+    def seconds(self):
+        return self.frame / self.fps
+
+    def tick(self):
+        self.frame += 1
+
+    def reset(self):
+        self.frame = 0
@@ -0,0 +1,105 @@
+from settings import TILE_SIZE
+
+SPATIAL_CELL_SIZE = TILE_SIZE * 4  # 128px buckets for platform lookups
+
+
+class SpatialHash:
+    """Uniform grid that buckets sprites by the cells their rects overlap.
+
+    Queries return sprites in insertion order so callers that rely on
+    ``hits[0]`` behave exactly like ``pygame.sprite.spritecollide`` over the
+    group the sprites were inserted from.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def __contains__(self, sprite):
+        return sprite in self.sprite_cells
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        return tuple((cx, cy)
+                     for cx in range(left, right + 1)
+                     for cy in range(top, bottom + 1))
+
+    def insert(self, sprite):
+        if sprite in self.sprite_cells:
+            self.move(sprite)
+            return
+        cells = self.cells_for(sprite.rect)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(sprite)
+        self.sprite_cells[sprite] = cells
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+
+    def remove(self, sprite):
+        cells = self.sprite_cells.pop(sprite, None)
+        if cells is None:
+            return
+        for cell in cells:
+            bucket = self.cells[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[cell]
+        del self.order[sprite]
+
+    def move(self, sprite):
+        """Re-bucket a sprite after its rect changed; cheap when it stays put."""
+        old_cells = self.sprite_cells.get(sprite)
+        if old_cells is None:
+            return
+        new_cells = self.cells_for(sprite.rect)
+        if new_cells == old_cells:
+            return
+        for cell in old_cells:
+            bucket = self.cells[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[cell]
+        for cell in new_cells:
+            self.cells.setdefault(cell, []).append(sprite)
+        self.sprite_cells[sprite] = new_cells
+
+    def query(self, rect):
+        """Return sprites whose rect overlaps ``rect``, in insertion order."""
+        found = []
+        seen = set()
+        cells = self.cells
+        for cell in self.cells_for(rect):
+            bucket = cells.get(cell)
+            if not bucket:
+                continue
+            for sprite in bucket:
+                if sprite in seen:
+                    continue
+                seen.add(sprite)
+                if sprite.rect.colliderect(rect):
+                    found.append(sprite)
+        if len(found) > 1:
+            found.sort(key=self.order.__getitem__)
+        return found
+
+    def collide(self, sprite):
+        """Drop-in replacement for ``spritecollide(sprite, group, False)``."""
+        return self.query(sprite.rect)
+
+    def any(self, rect):
+        cells = self.cells
+        for cell in self.cells_for(rect):
+            for sprite in cells.get(cell, ()):
+                if sprite.rect.colliderect(rect):
+                    return True
+        return False
@@ -0,0 +1,70 @@
+import pygame
+from settings import WINDOW_WIDTH
+
+
+class StaticLayer:
+    """Sprites that never move, pre-composited into screen-width chunks.
+
+    Each chunk surface only covers the vertical span its sprites occupy, so a
+    whole level of platforms costs a handful of blits per frame instead of one
+    blit per platform.
+    """
+
+    def __init__(self, sprites, chunk_width=WINDOW_WIDTH):
+        self.chunk_width = chunk_width
+        self.chunks = []
+        self.bake(sprites)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def bake(self, sprites):
+        columns = {}
+        for sprite in sprites:
+            first = sprite.rect.left // self.chunk_width
+            last = (sprite.rect.right - 1) // self.chunk_width
+            for column in range(first, last + 1):
+                columns.setdefault(column, []).append(sprite)
+
+        can_convert = pygame.display.get_surface() is not None
+        for column in sorted(columns):
+            members = columns[column]
+            bounds = members[0].rect.unionall([sprite.rect for sprite in members[1:]])
+            left = max(bounds.left, column * self.chunk_width)
+            right = min(bounds.right, (column + 1) * self.chunk_width)
+            chunk_rect = pygame.Rect(left, bounds.top, right - left, bounds.height)
+
+            image = pygame.Surface(chunk_rect.size, pygame.SRCALPHA)
+            for sprite in members:
+                image.blit(sprite.image, (sprite.rect.x - chunk_rect.x, sprite.rect.y - chunk_rect.y))
+            if can_convert:
+                image = image.convert_alpha()
+            self.chunks.append((chunk_rect, image))
+
+    def draw(self, surface, camera):
+        """Blit the on-screen chunks through the camera; returns the number of blits issued."""
+        blits = 0
+        for rect, image in self.chunks:
+            if camera.is_visible(rect):
+                surface.blit(image, camera.apply_rect(rect))
+                blits += 1
+        return blits
+
+
+class LayerGroup:
+    """Several StaticLayers drawn as one; endless mode adds one per chunk and retires it later."""
+
+    def __init__(self, layers=()):
+        self.layers = list(layers)
+
+    def __len__(self):
+        return sum(len(layer) for layer in self.layers)
+
+    def add(self, layer):
+        self.layers.append(layer)
+
+    def remove(self, layer):
+        self.layers.remove(layer)
+
+    def draw(self, surface, camera):
+        return sum(layer.draw(surface, camera) for layer in self.layers)
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+import pygame
+
+TEXT_CACHE_SIZE = 256  # Rendered labels kept before the least recently used is dropped
+
+
+class FontRegistry:
+    """Creates each ``pygame.font.Font(None, size)`` once and hands it back on request."""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, size, color).
+
+    Labels whose value has not changed since the last frame come straight
+    from the cache; only new strings pay for a font render.
+    """
+
+    def __init__(self, fonts=None, max_entries=TEXT_CACHE_SIZE):
+        self.fonts = fonts or FontRegistry()
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, text, size, color):
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+from layout import GENERATOR_VERSION
+from levelfile import (LEVEL_FILE_SUFFIX, LEVEL_FORMAT_VERSION, TEMP_SUFFIX, LevelFormatError, read_level,
+                       write_level)
+
+WORLD_CACHE_MAX_BYTES = 64 * 1024 * 1024
+STALE_TEMP_SECONDS = 60  # Temp files older than this belong to writes that died mid-way
+
+
+class WorldCache:
+    """Content-addressed directory of generated layouts.
+
+    Entries are keyed by (seed, world, difficulty profile, generator version)
+    and stored in the binary level format. A hit refreshes the file's mtime,
+    and writes evict the least recently used files once the directory grows
+    past ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=WORLD_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, seed, world, difficulty_profile):
+        payload = json.dumps({
+            "seed": seed,
+            "world": world,
+            "difficulty": difficulty_profile,
+            "generator": GENERATOR_VERSION,
+            "format": LEVEL_FORMAT_VERSION,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + LEVEL_FILE_SUFFIX)
+
+    def get(self, seed, world, difficulty_profile):
+        path = self.path_for(self.key(seed, world, difficulty_profile))
+        try:
+            layout = read_level(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except LevelFormatError:
+            # Stale or damaged entry; drop it and regenerate
+            self.discard(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return layout
+
+    def put(self, seed, world, difficulty_profile, layout):
+        path = self.path_for(self.key(seed, world, difficulty_profile))
+        write_level(path, layout, seed, world)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) for every cached level, oldest first.
+
+        Temp files left behind by crashed writers are swept on the way; recent
+        ones may still be in flight and are left alone.
+        """
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            is_temp = LEVEL_FILE_SUFFIX + TEMP_SUFFIX in name
+            if not (is_temp or name.endswith(LEVEL_FILE_SUFFIX)):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if is_temp:
+                if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    self.discard(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.discard(path)